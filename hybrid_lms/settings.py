@@ -113,6 +113,9 @@ DATABASES = {
 #     }
 # }
 
+# SQLite ignores the INCLUDE columns of covering indexes used on PostgreSQL
+SILENCED_SYSTEM_CHECKS = ['models.W040']
+
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
@@ -326,6 +329,9 @@ SPECTACULAR_SETTINGS = {
     ],
 }
 
+# Seconds the generated OpenAPI schema is served from the cache; 0 disables it
+API_SCHEMA_CACHE_TIMEOUT = config('API_SCHEMA_CACHE_TIMEOUT', default=0, cast=int)
+
 # Celery Configuration (for background tasks)
 CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379')
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://localhost:6379')
@@ -13,6 +13,9 @@ SECRET_KEY = config('SECRET_KEY')
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = config('DEBUG', default=False, cast=bool)
 
+# Serve the generated API schema from the cache between deploys
+API_SCHEMA_CACHE_TIMEOUT = config('API_SCHEMA_CACHE_TIMEOUT', default=3600, cast=int)
+
 # Allowed hosts should be configured in production
 ALLOWED_HOSTS = str(config('ALLOWED_HOSTS', default='localhost,127.0.0.1')).split(',')
 
@@ -9,6 +9,9 @@ from decouple import config
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = config('DEBUG', default=False, cast=bool)
 
+# Serve the generated API schema from the cache between deploys
+API_SCHEMA_CACHE_TIMEOUT = config('API_SCHEMA_CACHE_TIMEOUT', default=3600, cast=int)
+
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = config('SECRET_KEY', default='your-fallback-secret-key-here-make-sure-to-change-this')
 
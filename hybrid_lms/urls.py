@@ -4,6 +4,7 @@ from django.shortcuts import redirect
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from django.views.decorators.cache import cache_page
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
 
 def redirect_to_api(request):
@@ -16,7 +17,12 @@ urlpatterns = [
     # Health Check
     path('api/v1/', include('health.urls')),
     # API Documentation
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
+    # Generating the schema walks every endpoint, so it is cached between deploys
+    path(
+        'api/schema/',
+        cache_page(settings.API_SCHEMA_CACHE_TIMEOUT)(SpectacularAPIView.as_view()),
+        name='schema'
+    ),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
     
@@ -7,7 +7,7 @@ from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from .models import (
-    ShoppingCart, CartItem, Order, OrderItem, Payment, Refund,
+    ShoppingCart, CartItem, Order, OrderItem, Currency, Payment, Refund,
     InstructorPayout, Revenue, Coupon, CouponUsage
 )
 
@@ -18,9 +18,12 @@ class OrderAdmin(admin.ModelAdmin):
         'order_number', 'user', 'status', 'total_amount', 
         'created_at', 'completed_at'
     ]
-    list_filter = ['status', 'created_at', 'completed_at']
+    list_filter = ['status', 'billing_country', 'created_at', 'completed_at']
     search_fields = ['order_number', 'user__email', 'user__username']
-    readonly_fields = ['order_number', 'created_at', 'updated_at', 'completed_at']
+    readonly_fields = [
+        'order_number', 'billing_country', 'billing_postal_code',
+        'created_at', 'updated_at', 'completed_at'
+    ]
     date_hierarchy = 'created_at'
     
     fieldsets = (
@@ -35,7 +38,10 @@ class OrderAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
         ('Billing Information', {
-            'fields': ('billing_email', 'billing_name', 'billing_address'),
+            'fields': (
+                'billing_email', 'billing_name', 'billing_address',
+                'billing_country', 'billing_postal_code'
+            ),
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at', 'completed_at'),
@@ -51,6 +57,12 @@ class OrderAdmin(admin.ModelAdmin):
         return super().get_queryset(request).select_related('user')
 
 
+@admin.register(Currency)
+class CurrencyAdmin(admin.ModelAdmin):
+    list_display = ['alpha3', 'code']
+    search_fields = ['alpha3']
+
+
 @admin.register(Payment)
 class PaymentAdmin(admin.ModelAdmin):
     list_display = [
@@ -62,7 +74,7 @@ class PaymentAdmin(admin.ModelAdmin):
         'payment_id', 'external_payment_id', 
         'order__order_number', 'order__user__email'
     ]
-    readonly_fields = ['payment_id', 'created_at', 'processed_at']
+    readonly_fields = ['payment_id', 'gateway_response', 'created_at', 'processed_at']
     date_hierarchy = 'created_at'
     
     fieldsets = (
@@ -94,7 +106,7 @@ class PaymentAdmin(admin.ModelAdmin):
     order_link.short_description = 'Order'  # type: ignore
 
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('order', 'order__user')
+        return super().get_queryset(request).select_related('order', 'order__user', 'currency')
 
 
 @admin.register(Refund)
@@ -108,7 +120,7 @@ class RefundAdmin(admin.ModelAdmin):
         'refund_id', 'payment__payment_id', 
         'payment__order__order_number', 'requested_by__email'
     ]
-    readonly_fields = ['refund_id', 'created_at', 'processed_at']
+    readonly_fields = ['refund_id', 'gateway_response', 'created_at', 'processed_at']
     date_hierarchy = 'created_at'
     
     fieldsets = (
@@ -154,7 +166,9 @@ class InstructorPayoutAdmin(admin.ModelAdmin):
     search_fields = [
         'payout_id', 'instructor__email', 'instructor__username'
     ]
-    readonly_fields = ['payout_id', 'created_at', 'processed_at']
+    readonly_fields = [
+        'payout_id', 'net_amount', 'gateway_response', 'created_at', 'processed_at'
+    ]
     date_hierarchy = 'created_at'
     
     fieldsets = (
@@ -233,7 +247,7 @@ class CouponAdmin(admin.ModelAdmin):
     ]
     list_filter = ['coupon_type', 'status', 'is_public', 'created_at']
     search_fields = ['code', 'name', 'description']
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['current_uses', 'created_at', 'updated_at']
     date_hierarchy = 'created_at'
     
     fieldsets = (
@@ -307,14 +321,14 @@ class CartItemAdmin(admin.ModelAdmin):
 @admin.register(OrderItem)
 class OrderItemAdmin(admin.ModelAdmin):
     list_display = [
-        'order', 'course_title', 'instructor_name', 
+        'order_number_cache', 'course_title', 'instructor_name', 
         'unit_price', 'total_price', 'created_at'
     ]
     list_filter = ['created_at']
     search_fields = [
-        'order__order_number', 'course_title', 'instructor_name'
+        'order_number_cache', 'course_title', 'instructor_name'
     ]
-    readonly_fields = ['created_at']
+    readonly_fields = ['order_number_cache', 'created_at']
 
 
 @admin.register(CouponUsage)
@@ -0,0 +1,20 @@
+import decimal
+import logging
+
+from django.apps import AppConfig
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentsConfig(AppConfig):
+    name = 'payments'
+    verbose_name = 'Payments'
+    
+    def ready(self):
+        """Warn when Decimal falls back to the pure-Python implementation"""
+        # Only the C implementation (libmpdec) exposes its library version
+        if not getattr(decimal, '__libmpdec_version__', None):
+            logger.warning(
+                'decimal is using the pure-Python implementation; '
+                'payment calculations will be significantly slower'
+            )
@@ -0,0 +1,37 @@
+"""
+Model fields for the payments app.
+"""
+
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class CompressedJSONField(models.BinaryField):
+    """JSON value stored zlib-compressed in a binary column"""
+
+    description = 'Compressed JSON'
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return json.loads(zlib.decompress(bytes(value)))
+
+    def to_python(self, value):
+        if isinstance(value, (bytes, memoryview)):
+            return json.loads(zlib.decompress(bytes(value)))
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+
+    def get_prep_value(self, value):
+        if value is None:
+            return value
+        # Level 1: gateway payloads are written once and rarely read, so
+        # favour cheap compression over the smallest output
+        return zlib.compress(json.dumps(value, cls=DjangoJSONEncoder).encode(), 1)
+
+    def value_to_string(self, obj):
+        return json.dumps(self.value_from_object(obj), cls=DjangoJSONEncoder)
@@ -0,0 +1,19 @@
+"""
+Index types for the payments models.
+
+Production runs on PostgreSQL while development and the test suite run on
+SQLite, so PostgreSQL-only index methods degrade to a regular B-tree index
+on other databases.
+"""
+
+from django.contrib.postgres import indexes as postgres_indexes
+from django.db import models
+
+
+class HashIndex(postgres_indexes.HashIndex):
+    """Hash index on PostgreSQL, B-tree index on other databases"""
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            return models.Index.create_sql(self, model, schema_editor, using=using, **kwargs)
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
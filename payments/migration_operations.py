@@ -0,0 +1,63 @@
+"""
+Custom migration operations for the payments app.
+
+Production runs on PostgreSQL while development and the test suite run on
+SQLite. These operations keep the migration state identical on every
+backend and only emit PostgreSQL-specific DDL where it is supported.
+"""
+
+from django.contrib.postgres import operations as postgres_operations
+from django.db import migrations
+
+
+def is_postgresql(schema_editor):
+    """Return True when the migration runs against PostgreSQL"""
+    return schema_editor.connection.vendor == 'postgresql'
+
+
+class AddIndexConcurrently(postgres_operations.AddIndexConcurrently):
+    """
+    Create an index with CREATE INDEX CONCURRENTLY on PostgreSQL so writes
+    to live tables are not blocked during deploys, and with a plain
+    CREATE INDEX elsewhere. Migrations using it must set ``atomic = False``.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if is_postgresql(schema_editor):
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            migrations.AddIndex.database_forwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if is_postgresql(schema_editor):
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            migrations.AddIndex.database_backwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+
+class RunSQLOnPostgreSQL(migrations.RunSQL):
+    """RunSQL that only executes on PostgreSQL and is a no-op elsewhere"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if is_postgresql(schema_editor):
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if is_postgresql(schema_editor):
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class RunSQLOnSQLite(migrations.RunSQL):
+    """RunSQL that only executes on SQLite and is a no-op elsewhere"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'sqlite':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'sqlite':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
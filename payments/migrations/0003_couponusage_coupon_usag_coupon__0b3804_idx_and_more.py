@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+from payments.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('courses', '0001_initial'),
+        ('payments', '0002_revenue_remove_instructorrevenue_instructor_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='couponusage',
+            index=models.Index(fields=['coupon', 'used_at'], name='coupon_usag_coupon__0b3804_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='orderitem',
+            index=models.Index(fields=['order', 'created_at'], name='order_items_order_i_2aa65b_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='revenue',
+            index=models.Index(condition=models.Q(('payout__isnull', True)), fields=['instructor', 'created_at'], name='revenues_unpaid_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:31
+
+from django.db import migrations
+
+from payments.migration_operations import RunSQLOnPostgreSQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0003_couponusage_coupon_usag_coupon__0b3804_idx_and_more'),
+    ]
+
+    operations = [
+        # Keep free-text notes and gateway payloads out of line so the main
+        # heap rows stay narrow for reconciliation scans.
+        RunSQLOnPostgreSQL(
+            sql=[
+                'ALTER TABLE "refunds" ALTER COLUMN "description" SET STORAGE EXTERNAL;',
+                'ALTER TABLE "refunds" ALTER COLUMN "gateway_response" SET STORAGE EXTERNAL;',
+                'ALTER TABLE "coupons" ALTER COLUMN "description" SET STORAGE EXTERNAL;',
+            ],
+            reverse_sql=[
+                'ALTER TABLE "refunds" ALTER COLUMN "description" SET STORAGE EXTENDED;',
+                'ALTER TABLE "refunds" ALTER COLUMN "gateway_response" SET STORAGE EXTENDED;',
+                'ALTER TABLE "coupons" ALTER COLUMN "description" SET STORAGE EXTENDED;',
+            ],
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:23
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_cart_items(apps, schema_editor):
+    """Keep the oldest of any self-paced cart items added twice"""
+    CartItem = apps.get_model('payments', 'CartItem')
+    duplicates = (
+        CartItem.objects.filter(batch__isnull=True)
+        .values('cart_id', 'course_id')
+        .annotate(first_id=Min('id'), item_count=Count('id'))
+        .filter(item_count__gt=1)
+    )
+    for duplicate in duplicates:
+        CartItem.objects.filter(
+            cart_id=duplicate['cart_id'],
+            course_id=duplicate['course_id'],
+            batch__isnull=True
+        ).exclude(id=duplicate['first_id']).delete()
+
+
+def check_duplicate_order_items(apps, schema_editor):
+    """Refuse to migrate while an order holds the same self-paced course twice"""
+    OrderItem = apps.get_model('payments', 'OrderItem')
+    duplicates = (
+        OrderItem.objects.filter(batch__isnull=True)
+        .values('order_id', 'course_id')
+        .annotate(item_count=Count('id'))
+        .filter(item_count__gt=1)
+        .order_by('order_id', 'course_id')
+    )
+    if duplicates:
+        # Order items back revenue records, so they are resolved by hand
+        raise ValueError(
+            'Orders hold duplicate self-paced items; merge them before adding '
+            'order_items_unique_no_batch: %s'
+            % ', '.join(
+                'order %(order_id)s course %(course_id)s (%(item_count)s items)' % duplicate
+                for duplicate in duplicates
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+        ('payments', '0004_external_storage_for_notes'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_order_items, migrations.RunPython.noop),
+        migrations.RunPython(remove_duplicate_cart_items, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='cartitem',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='orderitem',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='cartitem',
+            constraint=models.UniqueConstraint(condition=models.Q(('batch__isnull', False)), fields=('cart', 'course', 'batch'), name='cart_items_unique_batch'),
+        ),
+        migrations.AddConstraint(
+            model_name='cartitem',
+            constraint=models.UniqueConstraint(condition=models.Q(('batch__isnull', True)), fields=('cart', 'course'), name='cart_items_unique_no_batch'),
+        ),
+        migrations.AddConstraint(
+            model_name='orderitem',
+            constraint=models.UniqueConstraint(condition=models.Q(('batch__isnull', False)), fields=('order', 'course', 'batch'), name='order_items_unique_batch'),
+        ),
+        migrations.AddConstraint(
+            model_name='orderitem',
+            constraint=models.UniqueConstraint(condition=models.Q(('batch__isnull', True)), fields=('order', 'course'), name='order_items_unique_no_batch'),
+        ),
+    ]
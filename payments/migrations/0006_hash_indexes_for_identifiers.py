@@ -0,0 +1,52 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:25
+
+import payments.indexes
+from django.conf import settings
+from django.db import migrations
+
+from payments.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('payments', '0005_cart_and_order_item_null_batch_uniqueness'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='instructorpayout',
+            name='instructor__payout__8ba702_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='order',
+            name='orders_order_n_1336be_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='payment',
+            name='payments_payment_2d1dd8_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='refund',
+            name='refunds_refund__ee280b_idx',
+        ),
+        AddIndexConcurrently(
+            model_name='instructorpayout',
+            index=payments.indexes.HashIndex(fields=['payout_id'], name='instructor__payout__c2a23c_hash'),
+        ),
+        AddIndexConcurrently(
+            model_name='order',
+            index=payments.indexes.HashIndex(fields=['order_number'], name='orders_order_n_04ff92_hash'),
+        ),
+        AddIndexConcurrently(
+            model_name='payment',
+            index=payments.indexes.HashIndex(fields=['payment_id'], name='payments_payment_73fbfe_hash'),
+        ),
+        AddIndexConcurrently(
+            model_name='refund',
+            index=payments.indexes.HashIndex(fields=['refund_id'], name='refunds_refund__2d76c1_hash'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:42
+
+from django.db import migrations
+
+from payments.migration_operations import RunSQLOnPostgreSQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0006_hash_indexes_for_identifiers'),
+    ]
+
+    operations = [
+        # Per-instructor totals of revenue not yet attached to a payout.
+        # Populated by payments.models.refresh_instructor_unpaid_totals().
+        RunSQLOnPostgreSQL(
+            sql=[
+                """
+                CREATE MATERIALIZED VIEW "instructor_unpaid_totals" AS
+                SELECT "instructor_id",
+                       SUM("instructor_earnings") AS "total",
+                       COUNT(*) AS "revenue_count"
+                FROM "revenues"
+                WHERE "payout_id" IS NULL
+                GROUP BY "instructor_id"
+                WITH NO DATA;
+                """,
+                'CREATE UNIQUE INDEX "instructor_unpaid_totals_instructor_id" '
+                'ON "instructor_unpaid_totals" ("instructor_id");',
+            ],
+            reverse_sql='DROP MATERIALIZED VIEW IF EXISTS "instructor_unpaid_totals";',
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:28
+
+from django.db import migrations
+
+from payments.migration_operations import RunSQLOnPostgreSQL, RunSQLOnSQLite
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0007_instructor_unpaid_totals_view'),
+    ]
+
+    operations = [
+        # coupons.current_uses is maintained in the database on every
+        # coupon_usages insert instead of a read-modify-write in the app.
+        RunSQLOnPostgreSQL(
+            sql=[
+                """
+                CREATE OR REPLACE FUNCTION bump_coupon_usage() RETURNS trigger AS $$
+                BEGIN
+                    UPDATE "coupons" SET "current_uses" = "current_uses" + 1
+                    WHERE "id" = NEW."coupon_id";
+                    RETURN NEW;
+                END;
+                $$ LANGUAGE plpgsql;
+                """,
+                'CREATE TRIGGER "t_bump_coupon" AFTER INSERT ON "coupon_usages" '
+                'FOR EACH ROW EXECUTE FUNCTION bump_coupon_usage();',
+            ],
+            reverse_sql=[
+                'DROP TRIGGER IF EXISTS "t_bump_coupon" ON "coupon_usages";',
+                'DROP FUNCTION IF EXISTS bump_coupon_usage();',
+            ],
+        ),
+        RunSQLOnSQLite(
+            sql="""
+                CREATE TRIGGER "t_bump_coupon" AFTER INSERT ON "coupon_usages"
+                FOR EACH ROW BEGIN
+                    UPDATE "coupons" SET "current_uses" = "current_uses" + 1
+                    WHERE "id" = NEW."coupon_id";
+                END;
+            """,
+            reverse_sql='DROP TRIGGER IF EXISTS "t_bump_coupon";',
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+CURRENCIES = [
+    (36, 'AUD'),
+    (124, 'CAD'),
+    (156, 'CNY'),
+    (344, 'HKD'),
+    (356, 'INR'),
+    (360, 'IDR'),
+    (392, 'JPY'),
+    (410, 'KRW'),
+    (458, 'MYR'),
+    (608, 'PHP'),
+    (702, 'SGD'),
+    (764, 'THB'),
+    (704, 'VND'),
+    (826, 'GBP'),
+    (840, 'USD'),
+    (978, 'EUR'),
+]
+
+
+def seed_currencies(apps, schema_editor):
+    Currency = apps.get_model('payments', 'Currency')
+    Currency.objects.bulk_create(
+        [Currency(code=code, alpha3=alpha3) for code, alpha3 in CURRENCIES]
+    )
+
+
+def copy_currency_codes(apps, schema_editor):
+    Currency = apps.get_model('payments', 'Currency')
+    Payment = apps.get_model('payments', 'Payment')
+    codes = dict(Currency.objects.values_list('alpha3', 'code'))
+    used = set(Payment.objects.values_list('currency_alpha3', flat=True).distinct())
+    unknown = {alpha3.upper() for alpha3 in used} - set(codes)
+    if unknown:
+        raise ValueError(
+            'Payments use currencies missing from the currencies table: %s'
+            % ', '.join(sorted(unknown))
+        )
+    for alpha3 in used:
+        Payment.objects.filter(currency_alpha3=alpha3).update(currency_id=codes[alpha3.upper()])
+
+
+def copy_currency_alpha3(apps, schema_editor):
+    Currency = apps.get_model('payments', 'Currency')
+    Payment = apps.get_model('payments', 'Payment')
+    for code, alpha3 in Currency.objects.values_list('code', 'alpha3'):
+        Payment.objects.filter(currency_id=code).update(currency_alpha3=alpha3)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0008_coupon_usage_count_trigger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Currency',
+            fields=[
+                ('code', models.SmallIntegerField(primary_key=True, serialize=False)),
+                ('alpha3', models.CharField(max_length=3, unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'currencies',
+                'db_table': 'currencies',
+                'ordering': ['alpha3'],
+            },
+        ),
+        migrations.RunPython(seed_currencies, migrations.RunPython.noop),
+        migrations.RenameField(
+            model_name='payment',
+            old_name='currency',
+            new_name='currency_alpha3',
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='currency',
+            field=models.ForeignKey(default=840, on_delete=django.db.models.deletion.PROTECT, related_name='payments', to='payments.currency'),
+        ),
+        migrations.RunPython(copy_currency_codes, copy_currency_alpha3),
+        migrations.RemoveField(
+            model_name='payment',
+            name='currency_alpha3',
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:32
+
+from django.db import migrations
+
+from payments.migration_operations import RunSQLOnPostgreSQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0009_currency_lookup_table'),
+    ]
+
+    operations = [
+        # Leave free space in each page so status/timestamp updates on these
+        # tables can stay HOT and skip index maintenance.
+        RunSQLOnPostgreSQL(
+            sql=[
+                'ALTER TABLE "orders" SET (fillfactor = 85);',
+                'ALTER TABLE "payments" SET (fillfactor = 85);',
+                'ALTER TABLE "refunds" SET (fillfactor = 85);',
+                'ALTER TABLE "instructor_payouts" SET (fillfactor = 85);',
+                'ALTER TABLE "shopping_carts" SET (fillfactor = 70);',
+            ],
+            reverse_sql=[
+                'ALTER TABLE "orders" RESET (fillfactor);',
+                'ALTER TABLE "payments" RESET (fillfactor);',
+                'ALTER TABLE "refunds" RESET (fillfactor);',
+                'ALTER TABLE "instructor_payouts" RESET (fillfactor);',
+                'ALTER TABLE "shopping_carts" RESET (fillfactor);',
+            ],
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:41
+
+from django.db import migrations, models
+
+
+def backfill_order_number_cache(apps, schema_editor):
+    Order = apps.get_model('payments', 'Order')
+    OrderItem = apps.get_model('payments', 'OrderItem')
+    OrderItem.objects.update(
+        order_number_cache=models.Subquery(
+            Order.objects.filter(pk=models.OuterRef('order_id')).values('order_number')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0010_hot_update_fillfactor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderitem',
+            name='order_number_cache',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=20),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_order_number_cache, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:40
+
+import payments.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0011_orderitem_order_number_cache'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='instructorpayout',
+            name='payout_id',
+            field=models.CharField(default=payments.models._gen_payout_id, max_length=50, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='order_number',
+            field=models.CharField(default=payments.models._gen_order_number, max_length=20, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='payment',
+            name='payment_id',
+            field=models.CharField(default=payments.models._gen_payment_id, max_length=50, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='refund',
+            name='refund_id',
+            field=models.CharField(default=payments.models._gen_refund_id, max_length=50, unique=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from payments.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('courses', '0001_initial'),
+        ('payments', '0012_generated_identifier_defaults'),
+    ]
+
+    operations = [
+        # Build the composite index before dropping the cart_id index it
+        # replaces so cart lookups are never left without one.
+        AddIndexConcurrently(
+            model_name='cartitem',
+            index=models.Index(fields=['cart', 'course'], name='cart_items_cart_id_d3e38a_idx'),
+        ),
+        migrations.AlterField(
+            model_name='cartitem',
+            name='cart',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='items', to='payments.shoppingcart'),
+        ),
+    ]
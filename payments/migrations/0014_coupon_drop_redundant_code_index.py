@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:42
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0013_cart_items_cart_course_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='coupon',
+            name='coupons_code_94ae53_idx',
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:47
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0014_coupon_drop_redundant_code_index'),
+    ]
+
+    operations = [
+        # A regular column cannot be altered into a generated one, so it is
+        # replaced; the database recomputes the value for existing rows.
+        migrations.RemoveField(
+            model_name='orderitem',
+            name='total_price',
+        ),
+        migrations.AddField(
+            model_name='orderitem',
+            name='total_price',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('unit_price'), '-', models.F('discount_amount')), output_field=models.DecimalField(decimal_places=2, max_digits=10)),
+        ),
+    ]
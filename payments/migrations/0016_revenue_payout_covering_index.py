@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+from payments.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('payments', '0015_orderitem_generated_total_price'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='revenue',
+            index=models.Index(fields=['instructor', 'is_paid', 'created_at'], include=('gross_amount', 'platform_commission', 'instructor_earnings'), name='revenue_payout_covering'),
+        ),
+        migrations.RemoveIndex(
+            model_name='revenue',
+            name='revenues_instruc_33bb19_idx',
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:49
+
+from django.db import migrations, models
+
+
+def billing_address_fields(address):
+    # Copied from payments.models as of this migration, so later edits there
+    # cannot change what the backfill writes
+    if not isinstance(address, dict):
+        return '', ''
+    country = str(address.get('country') or '').strip().upper()
+    postal_code = str(address.get('postal_code') or '').strip()
+    if len(country) != 2:
+        country = ''
+    return country, postal_code[:20]
+
+
+def backfill_billing_fields(apps, schema_editor):
+    Order = apps.get_model('payments', 'Order')
+    orders = []
+    for order in Order.objects.exclude(billing_address={}).only('id', 'billing_address').iterator():
+        order.billing_country, order.billing_postal_code = billing_address_fields(order.billing_address)
+        if order.billing_country or order.billing_postal_code:
+            orders.append(order)
+    Order.objects.bulk_update(orders, ['billing_country', 'billing_postal_code'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0016_revenue_payout_covering_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='billing_country',
+            field=models.CharField(blank=True, db_index=True, max_length=2),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='billing_postal_code',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+        migrations.RunPython(backfill_billing_fields, migrations.RunPython.noop),
+    ]
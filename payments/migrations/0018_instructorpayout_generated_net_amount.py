@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:02
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0017_order_billing_country_postal_code'),
+    ]
+
+    operations = [
+        # Replaced rather than altered, as with order_items.total_price; the
+        # database recomputes the value for existing rows.
+        migrations.RemoveField(
+            model_name='instructorpayout',
+            name='net_amount',
+        ),
+        migrations.AddField(
+            model_name='instructorpayout',
+            name='net_amount',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('gross_revenue'), '-', models.F('platform_commission')), output_field=models.DecimalField(decimal_places=2, max_digits=10)),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:00
+
+import payments.fields
+from django.db import migrations
+
+from payments.migration_operations import RunSQLOnPostgreSQL
+
+
+GATEWAY_RESPONSE_MODELS = ['payment', 'refund', 'instructorpayout']
+
+
+def compress_gateway_responses(apps, schema_editor):
+    for model_name in GATEWAY_RESPONSE_MODELS:
+        model = apps.get_model('payments', model_name)
+        rows = []
+        for row in model.objects.only('id', 'gateway_response').iterator():
+            row.gateway_response_compressed = row.gateway_response
+            rows.append(row)
+        model.objects.bulk_update(rows, ['gateway_response_compressed'], batch_size=500)
+
+
+def decompress_gateway_responses(apps, schema_editor):
+    for model_name in GATEWAY_RESPONSE_MODELS:
+        model = apps.get_model('payments', model_name)
+        rows = []
+        for row in model.objects.only('id', 'gateway_response_compressed').iterator():
+            row.gateway_response = row.gateway_response_compressed
+            rows.append(row)
+        model.objects.bulk_update(rows, ['gateway_response'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0018_instructorpayout_generated_net_amount'),
+    ]
+
+    # jsonb cannot be cast to bytea, so each column is rebuilt: add the
+    # compressed column, copy the data across, then swap it in.
+    operations = [
+        *[
+            migrations.AddField(
+                model_name=model_name,
+                name='gateway_response_compressed',
+                field=payments.fields.CompressedJSONField(blank=True, default=dict),
+            )
+            for model_name in GATEWAY_RESPONSE_MODELS
+        ],
+        migrations.RunPython(compress_gateway_responses, decompress_gateway_responses),
+        *[
+            migrations.RemoveField(
+                model_name=model_name,
+                name='gateway_response',
+            )
+            for model_name in GATEWAY_RESPONSE_MODELS
+        ],
+        *[
+            migrations.RenameField(
+                model_name=model_name,
+                old_name='gateway_response_compressed',
+                new_name='gateway_response',
+            )
+            for model_name in GATEWAY_RESPONSE_MODELS
+        ],
+        # The values are already compressed; stop PostgreSQL from trying
+        # again when they are moved to TOAST.
+        RunSQLOnPostgreSQL(
+            sql=[
+                'ALTER TABLE "payments" ALTER COLUMN "gateway_response" SET STORAGE EXTERNAL;',
+                'ALTER TABLE "refunds" ALTER COLUMN "gateway_response" SET STORAGE EXTERNAL;',
+                'ALTER TABLE "instructor_payouts" ALTER COLUMN "gateway_response" SET STORAGE EXTERNAL;',
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from payments.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('payments', '0019_compress_gateway_responses'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Build the composite index before dropping the payment_id indexes it
+        # replaces so refund lookups are never left without one.
+        AddIndexConcurrently(
+            model_name='refund',
+            index=models.Index(fields=['payment', 'status'], name='refunds_payment_908281_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='refund',
+            name='refunds_payment_0cace6_idx',
+        ),
+        migrations.AlterField(
+            model_name='refund',
+            name='payment',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='refunds', to='payments.payment'),
+        ),
+    ]
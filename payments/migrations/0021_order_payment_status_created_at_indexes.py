@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+from payments.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('payments', '0020_refund_payment_status_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(fields=['status', 'created_at'], name='orders_status_11db6c_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='payment',
+            index=models.Index(fields=['status', 'created_at'], name='payments_status_426d4f_idx'),
+        ),
+    ]
@@ -1,15 +1,76 @@
-from django.db import models
-from django.db import models
+import secrets
+
+from django.db import models, connection, transaction
 from django.conf import settings
+from django.core.cache import cache
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
 from django.utils import timezone
 from decimal import Decimal
 from django.core.validators import MinValueValidator, MaxValueValidator
 from typing import TYPE_CHECKING
 
+from .fields import CompressedJSONField
+from .indexes import HashIndex
+
 if TYPE_CHECKING:
     from django.db.models import QuerySet
 
 
+def to_cents(amount):
+    """Convert a two-place Decimal amount to integer cents"""
+    return int(amount.scaleb(2))
+
+
+def from_cents(cents):
+    """Convert integer cents back to a two-place Decimal amount"""
+    return Decimal(cents).scaleb(-2)
+
+
+def _gen_order_number():
+    """Generate unique order number"""
+    return f"ORD{timezone.now():%Y%m%d}{secrets.token_hex(4).upper()}"
+
+
+def _gen_payment_id():
+    """Generate unique payment ID"""
+    return f"PAY{timezone.now():%Y%m%d}{secrets.token_hex(4).upper()}"
+
+
+def _gen_refund_id():
+    """Generate unique refund ID"""
+    return f"REF{timezone.now():%Y%m%d}{secrets.token_hex(4).upper()}"
+
+
+def _gen_payout_id():
+    """Generate unique payout ID"""
+    return f"PO{timezone.now():%Y%m%d}{secrets.token_hex(4).upper()}"
+
+
+class ShoppingCartQuerySet(models.QuerySet):
+    """Queryset helpers for shopping carts"""
+    
+    def with_items(self):
+        """Prefetch cart items with the course, instructor and batch they display"""
+        return self.prefetch_related(
+            models.Prefetch(
+                'items',
+                queryset=CartItem.objects.select_related('course__instructor', 'batch')
+            )
+        )
+    
+    def with_summary(self):
+        """Annotate the cart total and item count read by ShoppingCart.summary"""
+        return self.annotate(
+            total_amount_agg=Coalesce(
+                models.Sum(models.F('items__unit_price') - models.F('items__discount_amount')),
+                models.Value(Decimal('0.00')),
+                output_field=models.DecimalField(max_digits=10, decimal_places=2)
+            ),
+            item_count_agg=models.Count('items')
+        )
+
+
 class ShoppingCart(models.Model):
     """Shopping cart for course purchases"""
     
@@ -17,6 +78,8 @@ class ShoppingCart(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ShoppingCartQuerySet.as_manager()
+    
     if TYPE_CHECKING:
         items: 'QuerySet[CartItem]'
     
@@ -26,23 +89,60 @@ class ShoppingCart(models.Model):
     def __str__(self):
         return f"Cart for {self.user.email}"
     
+    @cached_property
+    def summary(self):
+        """Cart total and item count from a single aggregate query"""
+        if hasattr(self, 'total_amount_agg'):
+            return {'total': self.total_amount_agg, 'count': self.item_count_agg}
+        return self.items.aggregate(
+            total=Coalesce(
+                models.Sum(models.F('unit_price') - models.F('discount_amount')),
+                models.Value(Decimal('0.00')),
+                output_field=models.DecimalField(max_digits=10, decimal_places=2)
+            ),
+            count=models.Count('id')
+        )
+    
     @property
     def total_amount(self):
-        return sum(item.total_price for item in self.items.all())
+        return self.summary['total']
     
     @property
     def item_count(self):
-        return self.items.count()
+        return self.summary['count']
     
     def clear(self):
         """Remove all items from cart"""
         self.items.all().delete()
+        self.__dict__.pop('summary', None)
+
+
+class CartItemQuerySet(models.QuerySet):
+    """Queryset helpers for cart items"""
+    
+    def bulk_add(self, cart, items):
+        """Add (course, batch) pairs to a cart in one INSERT, skipping ones already in it"""
+        # ON CONFLICT cannot target the partial unique constraints, so
+        # duplicates are ignored rather than upserted
+        return self.bulk_create(
+            [
+                CartItem(
+                    cart=cart,
+                    course=course,
+                    batch=batch,
+                    unit_price=CartItem.price_for(course, batch)
+                )
+                for course, batch in items
+            ],
+            ignore_conflicts=True
+        )
 
 
 class CartItem(models.Model):
     """Items in shopping cart"""
     
-    cart = models.ForeignKey(ShoppingCart, on_delete=models.CASCADE, related_name='items')
+    # Covered by the (cart, course) index below
+    cart = models.ForeignKey(ShoppingCart, on_delete=models.CASCADE, related_name='items', db_index=False)
     course = models.ForeignKey('courses.Course', on_delete=models.CASCADE, related_name='cart_items')
     batch = models.ForeignKey(
         'courses.CourseBatch', 
@@ -58,9 +158,28 @@ class CartItem(models.Model):
     
     added_at = models.DateTimeField(auto_now_add=True)
     
+    objects = CartItemQuerySet.as_manager()
+    
     class Meta:
         db_table = 'cart_items'
-        unique_together = ['cart', 'course', 'batch']
+        # Two partial constraints instead of unique_together: NULL batches
+        # never compare equal, so a single (cart, course, batch) constraint
+        # does not catch duplicate self-paced items.
+        constraints = [
+            models.UniqueConstraint(
+                fields=['cart', 'course', 'batch'],
+                condition=models.Q(batch__isnull=False),
+                name='cart_items_unique_batch'
+            ),
+            models.UniqueConstraint(
+                fields=['cart', 'course'],
+                condition=models.Q(batch__isnull=True),
+                name='cart_items_unique_no_batch'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['cart', 'course']),
+        ]
     
     def __str__(self):
         return f"{self.course.title} in cart for {self.cart.user.email}"
@@ -68,6 +187,42 @@ class CartItem(models.Model):
     @property
     def total_price(self):
         return self.unit_price - self.discount_amount
+    
+    @staticmethod
+    def price_for(course, batch=None):
+        """Price of a course, or of its batch when the batch has its own price"""
+        if batch and batch.price:
+            return batch.price
+        return course.price
+
+
+def billing_address_fields(address):
+    """Return the (country, postal_code) stored in a billing address"""
+    if not isinstance(address, dict):
+        return '', ''
+    country = str(address.get('country') or '').strip().upper()
+    postal_code = str(address.get('postal_code') or '').strip()
+    # Only ISO 3166-1 alpha-2 codes fit the column; free-text names are left out
+    if len(country) != 2:
+        country = ''
+    return country, postal_code[:20]
+
+
+class OrderQuerySet(models.QuerySet):
+    """Queryset helpers for orders"""
+    
+    def for_list(self):
+        """Skip large columns that order listings never show"""
+        return self.defer('user_agent', 'ip_address', 'billing_address')
+    
+    def with_items(self):
+        """Prefetch order items with the course and instructor they display"""
+        return self.prefetch_related(
+            models.Prefetch(
+                'items',
+                queryset=OrderItem.objects.select_related('course__instructor', 'batch')
+            )
+        )
 
 
 class Order(models.Model):
@@ -82,7 +237,7 @@ class Order(models.Model):
         REFUNDED = 'refunded', 'Refunded'
     
     # Order identification
-    order_number = models.CharField(max_length=20, unique=True)
+    order_number = models.CharField(max_length=20, unique=True, default=_gen_order_number)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='orders')
     
     # Pricing
@@ -106,36 +261,44 @@ class Order(models.Model):
     billing_email = models.EmailField()
     billing_name = models.CharField(max_length=200)
     billing_address = models.JSONField(default=dict, blank=True)
+    # Copied out of billing_address in save() so they can be filtered and indexed
+    billing_country = models.CharField(max_length=2, blank=True, db_index=True)
+    billing_postal_code = models.CharField(max_length=20, blank=True)
     
     # Additional metadata
     user_agent = models.TextField(blank=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     
+    objects = OrderQuerySet.as_manager()
+    
     class Meta:
         db_table = 'orders'
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['user', 'status']),
-            models.Index(fields=['order_number']),
+            HashIndex(fields=['order_number']),
             models.Index(fields=['-created_at']),
+            # Completed orders within a date range, for analytics and reports
+            models.Index(fields=['status', 'created_at']),
         ]
     
     def __str__(self):
         return f"Order {self.order_number} by {self.user.email}"
     
     def save(self, *args, **kwargs):
-        if not self.order_number:
-            self.order_number = self.generate_order_number()
-        
         if self.status == self.OrderStatus.COMPLETED and not self.completed_at:
             self.completed_at = timezone.now()
         
+        self.billing_country, self.billing_postal_code = billing_address_fields(self.billing_address)
+        
         super().save(*args, **kwargs)
     
-    def generate_order_number(self):
-        """Generate unique order number"""
-        import uuid
-        return f"ORD{timezone.now().strftime('%Y%m%d')}{str(uuid.uuid4())[:8].upper()}"
+    def mark_completed(self):
+        """Mark order as completed, writing only the status columns"""
+        # Saved rather than updated so analytics still receives post_save
+        self.status = self.OrderStatus.COMPLETED
+        self.completed_at = timezone.now()
+        self.save(update_fields=['status', 'completed_at', 'updated_at'])
 
 
 class OrderItem(models.Model):
@@ -154,20 +317,105 @@ class OrderItem(models.Model):
     # Pricing at time of purchase
     unit_price = models.DecimalField(max_digits=10, decimal_places=2)
     discount_amount = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
-    total_price = models.DecimalField(max_digits=10, decimal_places=2)
+    total_price = models.GeneratedField(
+        expression=models.F('unit_price') - models.F('discount_amount'),
+        output_field=models.DecimalField(max_digits=10, decimal_places=2),
+        db_persist=True
+    )
     
     # Course information at time of purchase (for historical records)
     course_title = models.CharField(max_length=200)
     instructor_name = models.CharField(max_length=200)
     
+    # Copy of Order.order_number, which never changes once assigned
+    order_number_cache = models.CharField(max_length=20, db_index=True, editable=False)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         db_table = 'order_items'
-        unique_together = ['order', 'course', 'batch']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['order', 'course', 'batch'],
+                condition=models.Q(batch__isnull=False),
+                name='order_items_unique_batch'
+            ),
+            models.UniqueConstraint(
+                fields=['order', 'course'],
+                condition=models.Q(batch__isnull=True),
+                name='order_items_unique_no_batch'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['order', 'created_at']),
+        ]
     
     def __str__(self):
-        return f"{self.course_title} - Order {self.order.order_number}"
+        return f"{self.course_title} - Order {self.order_number_cache}"
+    
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.order_number_cache:
+            self.order_number_cache = self.order.order_number
+        
+        super().save(*args, **kwargs)
+
+
+# Seconds a currency lookup is served from the cache
+CURRENCY_CACHE_TIMEOUT = 60 * 60
+
+
+class Currency(models.Model):
+    """ISO 4217 currencies keyed by their numeric code"""
+    
+    USD = 840
+    
+    code = models.SmallIntegerField(primary_key=True)
+    alpha3 = models.CharField(max_length=3, unique=True)
+    
+    class Meta:
+        db_table = 'currencies'
+        ordering = ['alpha3']
+        verbose_name_plural = 'currencies'
+    
+    def __str__(self):
+        return self.alpha3
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.invalidate_cache()
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.invalidate_cache()
+        return result
+    
+    @staticmethod
+    def cache_key(code):
+        return f'payments:currency:{code}'
+    
+    @classmethod
+    def get_cached(cls, code):
+        """Get a currency by numeric code, cached since the table only changes by hand"""
+        currency = cache.get_or_set(
+            cls.cache_key(code),
+            lambda: cls.objects.filter(code=code).first(),
+            timeout=CURRENCY_CACHE_TIMEOUT
+        )
+        if currency is None:
+            raise cls.DoesNotExist
+        return currency
+    
+    def invalidate_cache(self):
+        """Drop the cached copy once the current transaction commits"""
+        transaction.on_commit(lambda: cache.delete(self.cache_key(self.code)))
+
+
+class PaymentQuerySet(models.QuerySet):
+    """Queryset helpers for payments"""
+    
+    def for_list(self):
+        """Skip the gateway payload, which payment listings never show"""
+        return self.defer('gateway_response')
 
 
 class Payment(models.Model):
@@ -192,18 +440,20 @@ class Payment(models.Model):
         PARTIALLY_REFUNDED = 'partially_refunded', 'Partially Refunded'
     
     # Payment identification
-    payment_id = models.CharField(max_length=50, unique=True)
+    payment_id = models.CharField(max_length=50, unique=True, default=_gen_payment_id)
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='payments')
     
     # Payment details
     amount = models.DecimalField(max_digits=10, decimal_places=2)
-    currency = models.CharField(max_length=3, default='USD')
+    currency = models.ForeignKey(
+        Currency, on_delete=models.PROTECT, default=Currency.USD, related_name='payments'
+    )
     payment_method = models.CharField(max_length=20, choices=PaymentMethod.choices)
     
     # External payment system integration
     external_payment_id = models.CharField(max_length=100, blank=True)
     payment_gateway = models.CharField(max_length=50, blank=True)
-    gateway_response = models.JSONField(default=dict, blank=True)
+    gateway_response = CompressedJSONField(default=dict, blank=True)
     
     # Status and timestamps
     status = models.CharField(max_length=20, choices=PaymentStatus.choices, default=PaymentStatus.PENDING)
@@ -215,31 +465,38 @@ class Payment(models.Model):
     failure_reason = models.TextField(blank=True)
     failure_code = models.CharField(max_length=50, blank=True)
     
+    objects = PaymentQuerySet.as_manager()
+    
     class Meta:
         db_table = 'payments'
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['order', 'status']),
-            models.Index(fields=['payment_id']),
+            HashIndex(fields=['payment_id']),
             models.Index(fields=['external_payment_id']),
+            models.Index(fields=['status', 'created_at']),
         ]
     
     def __str__(self):
         return f"Payment {self.payment_id} - {self.amount} {self.currency}"
     
     def save(self, *args, **kwargs):
-        if not self.payment_id:
-            self.payment_id = self.generate_payment_id()
-        
         if self.status == self.PaymentStatus.COMPLETED and not self.processed_at:
             self.processed_at = timezone.now()
         
         super().save(*args, **kwargs)
     
-    def generate_payment_id(self):
-        """Generate unique payment ID"""
-        import uuid
-        return f"PAY{timezone.now().strftime('%Y%m%d')}{str(uuid.uuid4())[:8].upper()}"
+    def mark_processed(self):
+        """Mark payment as completed with a single conditional UPDATE"""
+        processed_at = timezone.now()
+        updated = Payment.objects.filter(pk=self.pk, processed_at__isnull=True).update(
+            status=self.PaymentStatus.COMPLETED,
+            processed_at=processed_at
+        )
+        if updated:
+            self.status = self.PaymentStatus.COMPLETED
+            self.processed_at = processed_at
+        return bool(updated)
 
 
 class Refund(models.Model):
@@ -259,8 +516,9 @@ class Refund(models.Model):
         OTHER = 'other', 'Other'
     
     # Refund identification
-    refund_id = models.CharField(max_length=50, unique=True)
-    payment = models.ForeignKey(Payment, on_delete=models.CASCADE, related_name='refunds')
+    refund_id = models.CharField(max_length=50, unique=True, default=_gen_refund_id)
+    # Covered by the (payment, status) index below
+    payment = models.ForeignKey(Payment, on_delete=models.CASCADE, related_name='refunds', db_index=False)
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='refunds')
     
     # Refund details
@@ -273,7 +531,7 @@ class Refund(models.Model):
     
     # External refund processing
     external_refund_id = models.CharField(max_length=100, blank=True)
-    gateway_response = models.JSONField(default=dict, blank=True)
+    gateway_response = CompressedJSONField(default=dict, blank=True)
     
     # Processing information
     requested_by = models.ForeignKey(
@@ -297,23 +555,13 @@ class Refund(models.Model):
         db_table = 'refunds'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['refund_id']),
+            HashIndex(fields=['refund_id']),
             models.Index(fields=['status', 'created_at']),
-            models.Index(fields=['payment']),
+            models.Index(fields=['payment', 'status']),
         ]
     
     def __str__(self):
         return f"Refund {self.refund_id} - {self.amount}"
-    
-    def save(self, *args, **kwargs):
-        if not self.refund_id:
-            self.refund_id = self.generate_refund_id()
-        super().save(*args, **kwargs)
-    
-    def generate_refund_id(self):
-        """Generate unique refund ID"""
-        import uuid
-        return f"REF{timezone.now().strftime('%Y%m%d')}{str(uuid.uuid4())[:8].upper()}"
 
 
 class InstructorPayout(models.Model):
@@ -327,7 +575,7 @@ class InstructorPayout(models.Model):
         CANCELLED = 'cancelled', 'Cancelled'
     
     # Payout identification
-    payout_id = models.CharField(max_length=50, unique=True)
+    payout_id = models.CharField(max_length=50, unique=True, default=_gen_payout_id)
     instructor = models.ForeignKey(
         settings.AUTH_USER_MODEL, 
         on_delete=models.CASCADE, 
@@ -342,7 +590,11 @@ class InstructorPayout(models.Model):
     gross_revenue = models.DecimalField(max_digits=10, decimal_places=2)
     platform_commission = models.DecimalField(max_digits=10, decimal_places=2)
     commission_rate = models.DecimalField(max_digits=5, decimal_places=4)  # e.g., 0.1000 for 10%
-    net_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    net_amount = models.GeneratedField(
+        expression=models.F('gross_revenue') - models.F('platform_commission'),
+        output_field=models.DecimalField(max_digits=10, decimal_places=2),
+        db_persist=True
+    )
     
     # Payout method
     payout_method = models.CharField(max_length=50)  # 'bank_transfer', 'paypal', etc.
@@ -353,7 +605,7 @@ class InstructorPayout(models.Model):
     
     # External payout processing
     external_payout_id = models.CharField(max_length=100, blank=True)
-    gateway_response = models.JSONField(default=dict, blank=True)
+    gateway_response = CompressedJSONField(default=dict, blank=True)
     
     # Processing information
     processed_by = models.ForeignKey(
@@ -377,26 +629,35 @@ class InstructorPayout(models.Model):
         unique_together = ['instructor', 'period_start', 'period_end']
         indexes = [
             models.Index(fields=['instructor', 'status']),
-            models.Index(fields=['payout_id']),
+            HashIndex(fields=['payout_id']),
             models.Index(fields=['period_start', 'period_end']),
         ]
     
     def __str__(self):
         return f"Payout {self.payout_id} to {self.instructor.email}"
-    
-    def save(self, *args, **kwargs):
-        if not self.payout_id:
-            self.payout_id = self.generate_payout_id()
-        
-        # Calculate net amount
-        self.net_amount = self.gross_revenue - self.platform_commission
-        
-        super().save(*args, **kwargs)
-    
-    def generate_payout_id(self):
-        """Generate unique payout ID"""
-        import uuid
-        return f"PO{timezone.now().strftime('%Y%m%d')}{str(uuid.uuid4())[:8].upper()}"
+
+
+class RevenueQuerySet(models.QuerySet):
+    """Queryset helpers for revenue records"""
+    
+    def create_for_order(self, order, items=None):
+        """Create revenue records for every item of an order in one INSERT"""
+        commission_rate = Decimal(str(settings.PLATFORM_COMMISSION_RATE))
+        # Callers that already loaded the items with their courses pass them in
+        if items is None:
+            items = order.items.select_related('course')
+        revenues = []
+        for item in items:
+            platform_commission = item.total_price * commission_rate
+            revenues.append(Revenue(
+                order_item=item,
+                instructor_id=item.course.instructor_id,
+                gross_amount=item.total_price,
+                platform_commission=platform_commission,
+                instructor_earnings=item.total_price - platform_commission,
+                commission_rate=commission_rate
+            ))
+        return self.bulk_create(revenues, batch_size=500)
 
 
 class Revenue(models.Model):
@@ -429,19 +690,66 @@ class Revenue(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     paid_at = models.DateTimeField(null=True, blank=True)
     
+    objects = RevenueQuerySet.as_manager()
+    
     class Meta:
         db_table = 'revenues'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['instructor', 'is_paid']),
+            # Covers the payout aggregation so it can use an index-only scan
+            models.Index(
+                fields=['instructor', 'is_paid', 'created_at'],
+                include=['gross_amount', 'platform_commission', 'instructor_earnings'],
+                name='revenue_payout_covering'
+            ),
             models.Index(fields=['created_at']),
             models.Index(fields=['payout']),
+            # Revenue not yet attached to a payout, scanned per instructor
+            # when calculating the next payout
+            models.Index(
+                fields=['instructor', 'created_at'],
+                condition=models.Q(payout__isnull=True),
+                name='revenues_unpaid_idx'
+            ),
         ]
     
     def __str__(self):
         return f"Revenue from {self.order_item.course_title} - {self.instructor_earnings}"
 
 
+def refresh_instructor_unpaid_totals():
+    """Refresh the instructor_unpaid_totals materialized view (PostgreSQL only)"""
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('REFRESH MATERIALIZED VIEW instructor_unpaid_totals')
+
+
+class CouponQuerySet(models.QuerySet):
+    """Queryset helpers for coupons"""
+    
+    def currently_valid(self):
+        """Coupons that are active, within their validity period and not used up"""
+        now = timezone.now()
+        return self.filter(
+            models.Q(max_uses__isnull=True) | models.Q(current_uses__lt=models.F('max_uses')),
+            status=Coupon.CouponStatus.ACTIVE,
+            valid_from__lte=now,
+            valid_until__gte=now
+        )
+    
+    def with_applicable_courses(self):
+        """Prefetch the ids of the courses each coupon is restricted to"""
+        course_model = Coupon._meta.get_field('applicable_courses').related_model
+        return self.prefetch_related(
+            models.Prefetch('applicable_courses', queryset=course_model.objects.only('id'))
+        )
+
+
+# Seconds a coupon lookup is served from the cache
+COUPON_CACHE_TIMEOUT = 60
+
+
 class Coupon(models.Model):
     """Discount coupons for courses"""
     
@@ -480,6 +788,7 @@ class Coupon(models.Model):
     # Usage limits
     max_uses = models.IntegerField(null=True, blank=True)
     max_uses_per_user = models.IntegerField(default=1)
+    # Incremented by the t_bump_coupon trigger on coupon_usages inserts
     current_uses = models.IntegerField(default=0)
     
     # Validity period
@@ -510,11 +819,12 @@ class Coupon(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CouponQuerySet.as_manager()
+    
     class Meta:
         db_table = 'coupons'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['code']),
             models.Index(fields=['status', 'valid_from', 'valid_until']),
             models.Index(fields=['created_by']),
         ]
@@ -522,7 +832,43 @@ class Coupon(models.Model):
     def __str__(self):
         return f"Coupon {self.code} - {self.name}"
     
-    @property
+    def save(self, *args, **kwargs):
+        # current_uses belongs to the usage trigger, so an edit must not write
+        # back the count it read before a redemption landed
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'current_uses'
+            ]
+        super().save(*args, **kwargs)
+        self.invalidate_cache()
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.invalidate_cache()
+        return result
+    
+    @staticmethod
+    def cache_key(code):
+        return f'payments:coupon:{code}'
+    
+    @classmethod
+    def get_cached(cls, code):
+        """Get a coupon with its applicable courses, cached briefly to spare the database under promotions"""
+        coupon = cache.get_or_set(
+            cls.cache_key(code),
+            lambda: cls.objects.with_applicable_courses().filter(code=code).first(),
+            timeout=COUPON_CACHE_TIMEOUT
+        )
+        if coupon is None:
+            raise cls.DoesNotExist
+        return coupon
+    
+    def invalidate_cache(self):
+        """Drop the cached copy once the current transaction commits"""
+        transaction.on_commit(lambda: cache.delete(self.cache_key(self.code)))
+    
+    @cached_property
     def is_valid(self):
         """Check if coupon is currently valid"""
         now = timezone.now()
@@ -534,17 +880,44 @@ class Coupon(models.Model):
     
     def calculate_discount(self, amount):
         """Calculate discount amount for given order amount"""
-        if not self.is_valid or amount < self.minimum_amount:
-            return Decimal('0.00')
+        return from_cents(self.calculate_discount_cents(to_cents(amount)))
+    
+    def calculate_discount_cents(self, amount_cents):
+        """Calculate discount in integer cents for given order amount in cents"""
+        if not self.is_valid or amount_cents < to_cents(self.minimum_amount):
+            return 0
         
         if self.coupon_type == self.CouponType.PERCENTAGE:
-            return min(amount * (self.discount_percentage / 100), amount)
+            # Percentage has two decimal places; round half up to the cent
+            discount_cents = (amount_cents * to_cents(self.discount_percentage) + 5000) // 10000
+            return min(discount_cents, amount_cents)
         elif self.coupon_type == self.CouponType.FIXED_AMOUNT:
-            return min(self.discount_amount, amount)
+            return min(to_cents(self.discount_amount), amount_cents)
         elif self.coupon_type == self.CouponType.FREE_COURSE:
-            return amount
+            return amount_cents
         
-        return Decimal('0.00')
+        return 0
+    
+    def has_uses_left_for(self, user):
+        """Check the per-user redemption limit with a single COUNT query"""
+        return self.usages.filter(user=user).count() < self.max_uses_per_user
+    
+    def applies_to(self, course_ids):
+        """Check if coupon can be used for any of the given courses"""
+        applicable_ids = {course.id for course in self.applicable_courses.all()}
+        return not applicable_ids or not applicable_ids.isdisjoint(course_ids)
+    
+    def record_usage(self, user, order, discount_amount):
+        """Record a redemption; current_uses is incremented in the database by a trigger"""
+        usage = CouponUsage.objects.create(
+            coupon=self,
+            user=user,
+            order=order,
+            discount_amount=discount_amount
+        )
+        # The cached copy still carries the old current_uses
+        self.invalidate_cache()
+        return usage
 
 
 class CouponUsage(models.Model):
@@ -562,6 +935,7 @@ class CouponUsage(models.Model):
         unique_together = ['coupon', 'order']
         indexes = [
             models.Index(fields=['coupon', 'user']),
+            models.Index(fields=['coupon', 'used_at']),
             models.Index(fields=['used_at']),
         ]
     
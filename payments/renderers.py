@@ -0,0 +1,40 @@
+"""
+Renderers for the payments app.
+"""
+
+import csv
+
+from rest_framework import renderers
+
+
+class Echo:
+    """File-like object that hands back whatever is written to it"""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows, header=None):
+    """Yield CSV lines for an iterable of flat dicts, taking the header from the first row if not given"""
+    writer = csv.writer(Echo())
+    if header is not None:
+        yield writer.writerow(header)
+    for row in rows:
+        if header is None:
+            header = list(row)
+            yield writer.writerow(header)
+        yield writer.writerow([row.get(key) for key in header])
+
+
+class CSVRenderer(renderers.BaseRenderer):
+    """Render a dict or a list of flat dicts as CSV"""
+
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(iter_csv(rows)).encode(self.charset)
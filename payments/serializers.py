@@ -1,19 +1,142 @@
 from rest_framework import serializers
 from decimal import Decimal
+from django.core.exceptions import FieldDoesNotExist
+from django.db import IntegrityError, models, transaction
 from django.utils import timezone
+from accounts.models import User
+from courses.models import Course, Enrollment
 from .models import (
-    ShoppingCart, CartItem, Order, OrderItem, Payment, Refund,
-    InstructorPayout, Revenue, Coupon, CouponUsage
+    ShoppingCart, CartItem, Order, OrderItem, Currency, Payment, Refund,
+    InstructorPayout, Revenue, Coupon, CouponUsage, to_cents, from_cents
 )
 
+# Optional faster JSON validation for request payloads
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
 
-class CartItemSerializer(serializers.ModelSerializer):
+ZERO = Decimal('0.00')
+
+
+def _related_lookups(serializer, model):
+    """Collect the select_related lookups and Prefetch objects for the relations a serializer reads"""
+    select, prefetch = set(), {}
+    for field in serializer.fields.values():
+        # Primary key fields read the local *_id column
+        if field.source == '*' or isinstance(field, serializers.PrimaryKeyRelatedField):
+            continue
+        
+        path, related_model, many = [], model, False
+        for attr in field.source.split('.'):
+            try:
+                model_field = related_model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                break
+            if not model_field.is_relation:
+                break
+            path.append(attr)
+            many = many or model_field.many_to_many or model_field.one_to_many
+            related_model = model_field.related_model
+        if not path:
+            continue
+        
+        lookup = '__'.join(path)
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        nested_select, nested_prefetch = set(), []
+        if isinstance(nested, serializers.ModelSerializer):
+            nested_select, nested_prefetch = _related_lookups(nested, related_model)
+        
+        if many:
+            # Nested relations are loaded by the prefetch query itself
+            queryset = related_model._default_manager.select_related(*sorted(nested_select))
+            if nested_prefetch:
+                queryset = queryset.prefetch_related(*nested_prefetch)
+            prefetch[lookup] = models.Prefetch(lookup, queryset=queryset)
+        else:
+            select.add(lookup)
+            select |= {f'{lookup}__{nested_lookup}' for nested_lookup in nested_select}
+            for nested_lookup in nested_prefetch:
+                prefetch_to = f'{lookup}__{nested_lookup.prefetch_to}'
+                prefetch[prefetch_to] = models.Prefetch(prefetch_to, queryset=nested_lookup.queryset)
+    return select, list(prefetch.values())
+
+
+def _loaded_fields(serializer, model):
+    """Names of the model columns a serializer reads, or None if it may read anything"""
+    names = {model._meta.pk.name}
+    for field in serializer.fields.values():
+        if field.source == '*' or isinstance(field, serializers.SerializerMethodField):
+            return None
+        try:
+            model_field = model._meta.get_field(field.source.split('.')[0])
+        except FieldDoesNotExist:
+            # Properties may read any column
+            return None
+        if model_field.concrete:
+            names.add(model_field.name)
+    return names
+
+
+class FastJSONField(serializers.JSONField):
+    """JSONField that checks payloads with orjson when it is installed"""
+    
+    def to_internal_value(self, data):
+        if orjson is None or self.binary or self.encoder or getattr(data, 'is_json_string', False):
+            return super().to_internal_value(data)
+        try:
+            orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson is stricter than json (e.g. integers over 64 bits), so let
+            # the standard check decide what is actually invalid
+            return super().to_internal_value(data)
+        return data
+
+
+class PurchasableCourseField(serializers.PrimaryKeyRelatedField):
+    """Course field that also loads whether the requesting user is already enrolled"""
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        request = self.context.get('request')
+        if request is None:
+            return queryset
+        return queryset.annotate(is_enrolled=models.Exists(
+            Enrollment.objects.filter(student=request.user, course=models.OuterRef('pk'), is_active=True)
+        ))
+
+
+class PaymentsBaseSerializer(serializers.ModelSerializer):
+    """Model serializer that knows which columns and relations its fields read"""
+    
+    @classmethod
+    def optimize_queryset(cls, queryset):
+        """Load only the columns and relations this serializer needs"""
+        if '_lookups' not in cls.__dict__:
+            serializer = cls()
+            cls._lookups = (
+                *_related_lookups(serializer, cls.Meta.model),
+                _loaded_fields(serializer, cls.Meta.model),
+            )
+        select, prefetch, only = cls._lookups
+        if only is not None:
+            queryset = queryset.only(*sorted(only))
+        if select:
+            queryset = queryset.select_related(*sorted(select))
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
+
+
+class CartItemSerializer(PaymentsBaseSerializer):
     """Shopping cart item serializer"""
     course_title = serializers.CharField(source='course.title', read_only=True)
     course_thumbnail = serializers.ImageField(source='course.thumbnail', read_only=True)
     instructor_name = serializers.CharField(source='course.instructor.full_name', read_only=True)
     batch_name = serializers.CharField(source='batch.name', read_only=True)
     total_price = serializers.ReadOnlyField()
+    # Load the instructor with the course so the response needs no extra query
+    course = PurchasableCourseField(queryset=Course.objects.select_related('instructor'))
     
     class Meta:
         model = CartItem
@@ -32,7 +155,7 @@ class CartItemSerializer(serializers.ModelSerializer):
         if course.course_type == course.CourseType.STRUCTURED:
             if not batch:
                 raise serializers.ValidationError("Batch is required for structured courses")
-            if batch.course != course:
+            if batch.course_id != course.pk:
                 raise serializers.ValidationError("Batch does not belong to this course")
             if not batch.is_enrollment_open:
                 raise serializers.ValidationError("Enrollment is closed for this batch")
@@ -48,28 +171,18 @@ class CartItemSerializer(serializers.ModelSerializer):
         course = validated_data['course']
         batch = validated_data.get('batch')
         
-        # Check if item already in cart
-        existing_item = CartItem.objects.filter(
-            cart=cart,
-            course=course,
-            batch=batch
-        ).first()
-        
-        if existing_item:
+        # The partial unique constraints reject items already in the cart,
+        # which also covers two concurrent adds of the same course
+        try:
+            with transaction.atomic():
+                return CartItem.objects.create(
+                    cart=cart,
+                    course=course,
+                    batch=batch,
+                    unit_price=CartItem.price_for(course, batch)
+                )
+        except IntegrityError:
             raise serializers.ValidationError("Item already in cart")
-        
-        # Set price from course or batch
-        if batch and batch.price:
-            unit_price = batch.price
-        else:
-            unit_price = course.price
-        
-        return CartItem.objects.create(
-            cart=cart,
-            course=course,
-            batch=batch,
-            unit_price=unit_price
-        )
 
 
 class ShoppingCartSerializer(serializers.ModelSerializer):
@@ -86,10 +199,12 @@ class ShoppingCartSerializer(serializers.ModelSerializer):
         )
 
 
-class OrderItemSerializer(serializers.ModelSerializer):
+class OrderItemSerializer(PaymentsBaseSerializer):
     """Order item serializer"""
     course_title = serializers.CharField(source='course.title', read_only=True)
     instructor_name = serializers.CharField(source='course.instructor.full_name', read_only=True)
+    # Generated columns map to a bare ModelField; declare the decimal type explicitly
+    total_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
     
     class Meta:
         model = OrderItem
@@ -99,7 +214,7 @@ class OrderItemSerializer(serializers.ModelSerializer):
         )
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(PaymentsBaseSerializer):
     """Order list serializer"""
     items = OrderItemSerializer(many=True, read_only=True)
     
@@ -112,7 +227,7 @@ class OrderSerializer(serializers.ModelSerializer):
         )
 
 
-class OrderDetailSerializer(serializers.ModelSerializer):
+class OrderDetailSerializer(PaymentsBaseSerializer):
     """Detailed order serializer"""
     items = OrderItemSerializer(many=True, read_only=True)
     
@@ -131,15 +246,19 @@ class OrderCreateSerializer(serializers.Serializer):
     """Order creation serializer"""
     billing_name = serializers.CharField(max_length=200)
     billing_email = serializers.EmailField()
-    billing_address = serializers.JSONField(required=False, default=dict)
+    billing_address = FastJSONField(required=False, default=dict)
     coupon_code = serializers.CharField(max_length=50, required=False)
     
     def validate_coupon_code(self, value):
         if value:
             try:
-                coupon = Coupon.objects.get(code=value)
+                coupon = Coupon.get_cached(value)
                 if not coupon.is_valid:
                     raise serializers.ValidationError("Coupon is not valid")
+                if not coupon.has_uses_left_for(self.context['request'].user):
+                    raise serializers.ValidationError("Coupon usage limit exceeded")
+                # Reused by create() so the coupon is only fetched once
+                self._coupon = coupon
                 return value
             except Coupon.DoesNotExist:
                 raise serializers.ValidationError("Invalid coupon code")
@@ -154,77 +273,74 @@ class OrderCreateSerializer(serializers.Serializer):
         except ShoppingCart.DoesNotExist:
             raise serializers.ValidationError("Cart is empty")
         
-        if not cart.items.exists():
+        # Load items with the course and instructor details copied onto the order
+        cart_items = list(cart.items.select_related('course__instructor', 'batch'))
+        if not cart_items:
             raise serializers.ValidationError("Cart is empty")
         
-        # Calculate totals
-        subtotal = cart.total_amount
-        discount_amount = Decimal('0.00')
-        coupon_discount_amount = Decimal('0.00')
+        # Totals are summed in integer cents and converted once for the order row
+        subtotal_cents = sum(to_cents(cart_item.total_price) for cart_item in cart_items)
+        coupon_discount_cents = 0
         
         # Apply coupon if provided
-        coupon = None
         coupon_code = validated_data.get('coupon_code')
-        if coupon_code:
-            try:
-                coupon = Coupon.objects.get(code=coupon_code)
-                if coupon.is_valid:
-                    coupon_discount_amount = coupon.calculate_discount(subtotal)
-            except Coupon.DoesNotExist:
-                pass
-        
-        total_amount = subtotal - coupon_discount_amount
-        
-        # Create order
-        order = Order.objects.create(
-            user=request.user,
-            subtotal=subtotal,
-            discount_amount=discount_amount,
-            total_amount=total_amount,
-            coupon_code=coupon_code or '',
-            coupon_discount_amount=coupon_discount_amount,
-            billing_name=validated_data['billing_name'],
-            billing_email=validated_data['billing_email'],
-            billing_address=validated_data.get('billing_address', {}),
-            user_agent=request.META.get('HTTP_USER_AGENT', ''),
-            ip_address=request.META.get('REMOTE_ADDR')
-        )
+        coupon = getattr(self, '_coupon', None) if coupon_code else None
+        if coupon:
+            course_ids = {cart_item.course_id for cart_item in cart_items}
+            if coupon.applies_to(course_ids):
+                coupon_discount_cents = coupon.calculate_discount_cents(subtotal_cents)
         
-        # Create order items from cart
-        for cart_item in cart.items.all():
-            OrderItem.objects.create(
-                order=order,
-                course=cart_item.course,
-                batch=cart_item.batch,
-                unit_price=cart_item.unit_price,
-                discount_amount=cart_item.discount_amount,
-                total_price=cart_item.total_price,
-                course_title=cart_item.course.title,
-                instructor_name=cart_item.course.instructor.full_name or cart_item.course.instructor.username
-            )
+        subtotal = from_cents(subtotal_cents)
+        discount_amount = ZERO
+        coupon_discount_amount = from_cents(coupon_discount_cents)
+        total_amount = from_cents(subtotal_cents - coupon_discount_cents)
         
-        # Record coupon usage
-        if coupon and coupon_discount_amount > 0:
-            CouponUsage.objects.create(
-                coupon=coupon,
+        with transaction.atomic():
+            # Create order
+            order = Order.objects.create(
                 user=request.user,
-                order=order,
-                discount_amount=coupon_discount_amount
+                subtotal=subtotal,
+                discount_amount=discount_amount,
+                total_amount=total_amount,
+                coupon_code=coupon_code or '',
+                coupon_discount_amount=coupon_discount_amount,
+                billing_name=validated_data['billing_name'],
+                billing_email=validated_data['billing_email'],
+                billing_address=validated_data.get('billing_address', {}),
+                user_agent=request.META.get('HTTP_USER_AGENT', ''),
+                ip_address=request.META.get('REMOTE_ADDR')
             )
             
-            # Update coupon usage count
-            coupon.current_uses += 1
-            coupon.save(update_fields=['current_uses'])
-        
-        # Clear cart
-        cart.clear()
+            # Create order items from cart; bulk_create skips OrderItem.save(),
+            # so the order number copy is set here
+            OrderItem.objects.bulk_create([
+                OrderItem(
+                    order=order,
+                    course=cart_item.course,
+                    batch=cart_item.batch,
+                    unit_price=cart_item.unit_price,
+                    discount_amount=cart_item.discount_amount,
+                    course_title=cart_item.course.title,
+                    instructor_name=cart_item.course.instructor.display_name,
+                    order_number_cache=order.order_number
+                )
+                for cart_item in cart_items
+            ], batch_size=500)
+            
+            # Record coupon usage
+            if coupon and coupon_discount_amount > 0:
+                coupon.record_usage(request.user, order, coupon_discount_amount)
+            
+            # Clear cart
+            cart.clear()
         
         return order
 
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(PaymentsBaseSerializer):
     """Payment serializer"""
     order_number = serializers.CharField(source='order.order_number', read_only=True)
+    currency = serializers.SlugRelatedField(slug_field='alpha3', read_only=True)
     
     class Meta:
         model = Payment
@@ -242,7 +358,7 @@ class PaymentCreateSerializer(serializers.Serializer):
         choices=Payment.PaymentMethod.choices
     )
     external_payment_id = serializers.CharField(max_length=100, required=False)
-    gateway_response = serializers.JSONField(required=False, default=dict)
+    gateway_response = FastJSONField(required=False, default=dict)
     
     def create(self, validated_data):
         order = self.context['order']
@@ -251,7 +367,8 @@ class PaymentCreateSerializer(serializers.Serializer):
         payment = Payment.objects.create(
             order=order,
             amount=order.total_amount,
-            currency='USD',  # TODO: Make configurable
+            # The cached instance also serves the currency alpha3 in the response
+            currency=Currency.get_cached(Currency.USD),  # TODO: Make configurable
             payment_method=validated_data['payment_method'],
             external_payment_id=validated_data.get('external_payment_id', ''),
             gateway_response=validated_data.get('gateway_response', {})
@@ -260,7 +377,7 @@ class PaymentCreateSerializer(serializers.Serializer):
         return payment
 
 
-class RefundSerializer(serializers.ModelSerializer):
+class RefundSerializer(PaymentsBaseSerializer):
     """Refund serializer"""
     order_number = serializers.CharField(source='order.order_number', read_only=True)
     requested_by_name = serializers.CharField(source='requested_by.username', read_only=True)
@@ -310,6 +427,8 @@ class CouponSerializer(serializers.ModelSerializer):
             'valid_until', 'minimum_amount', 'status', 'is_public',
             'valid_status', 'created_at'
         )
+        # Maintained by a database trigger as usages are recorded
+        read_only_fields = ('current_uses',)
 
 
 class CouponCreateSerializer(serializers.ModelSerializer):
@@ -349,9 +468,11 @@ class CouponCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class InstructorPayoutSerializer(serializers.ModelSerializer):
+class InstructorPayoutSerializer(PaymentsBaseSerializer):
     """Instructor payout serializer"""
     instructor_name = serializers.CharField(source='instructor.full_name', read_only=True)
+    # Generated columns map to a bare ModelField; declare the decimal type explicitly
+    net_amount = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
     
     class Meta:
         model = InstructorPayout
@@ -363,7 +484,27 @@ class InstructorPayoutSerializer(serializers.ModelSerializer):
         )
 
 
-class RevenueSerializer(serializers.ModelSerializer):
+class PayoutProcessSerializer(serializers.Serializer):
+    """Admin payout processing serializer"""
+    # Only the columns the response needs are loaded with the instructor
+    instructor_id = serializers.PrimaryKeyRelatedField(
+        source='instructor',
+        queryset=User.objects.filter(role=User.UserRole.INSTRUCTOR).only('id', 'username', 'full_name'),
+        error_messages={'does_not_exist': 'Invalid instructor'}
+    )
+    period_start = serializers.DateField()
+    period_end = serializers.DateField()
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0.01'))
+    payout_method = serializers.CharField(max_length=50)
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+    
+    def validate(self, attrs):
+        if attrs['period_end'] < attrs['period_start']:
+            raise serializers.ValidationError("Period end must not be before period start")
+        return attrs
+
+
+class RevenueSerializer(PaymentsBaseSerializer):
     """Revenue tracking serializer"""
     course_title = serializers.CharField(source='order_item.course_title', read_only=True)
     instructor_name = serializers.CharField(source='instructor.full_name', read_only=True)
@@ -377,7 +518,7 @@ class RevenueSerializer(serializers.ModelSerializer):
         )
 
 
-class CouponUsageSerializer(serializers.ModelSerializer):
+class CouponUsageSerializer(PaymentsBaseSerializer):
     """Coupon usage tracking serializer"""
     user_name = serializers.CharField(source='user.username', read_only=True)
     order_number = serializers.CharField(source='order.order_number', read_only=True)
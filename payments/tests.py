@@ -2,16 +2,21 @@
 Tests for Financial Management Module
 """
 
+import csv
+
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from decimal import Decimal
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 
-from .models import Order, Payment, InstructorPayout, Revenue
-from courses.models import Course
+from .models import (
+    ShoppingCart, CartItem, Order, Currency, Payment, InstructorPayout, Revenue,
+    Coupon, CouponUsage, Refund
+)
+from courses.models import Course, Enrollment
 
 User = get_user_model()
 
@@ -19,75 +24,75 @@ User = get_user_model()
 class FinancialManagementTestCase(APITestCase):
     """Test cases for financial management functionality"""
 
-    def setUp(self):
-        """Set up test data"""
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once for the class"""
         # Create users
-        self.admin_user = User.objects.create_user(  # type: ignore
+        cls.admin_user = User.objects.create_user(  # type: ignore
             email='admin@example.com',
             username='admin',
             password='testpass123'
         )
-        self.admin_user.role = User.UserRole.ADMIN  # type: ignore
-        self.admin_user.save()
+        cls.admin_user.role = User.UserRole.ADMIN  # type: ignore
+        cls.admin_user.save()
         
-        self.instructor_user = User.objects.create_user(  # type: ignore
+        cls.instructor_user = User.objects.create_user(  # type: ignore
             email='instructor@example.com',
             username='instructor',
             password='testpass123'
         )
-        self.instructor_user.role = User.UserRole.INSTRUCTOR  # type: ignore
-        self.instructor_user.save()
+        cls.instructor_user.role = User.UserRole.INSTRUCTOR  # type: ignore
+        cls.instructor_user.save()
         
-        self.student_user = User.objects.create_user(  # type: ignore
+        cls.student_user = User.objects.create_user(  # type: ignore
             email='student@example.com',
             username='student',
             password='testpass123'
         )
-        self.student_user.role = User.UserRole.STUDENT  # type: ignore
-        self.student_user.save()
+        cls.student_user.role = User.UserRole.STUDENT  # type: ignore
+        cls.student_user.save()
         
         # Create course
-        self.course = Course.objects.create(
+        cls.course = Course.objects.create(
             title='Test Course',
             description='Test course description',
             price=Decimal('100000.00'),
-            instructor=self.instructor_user
+            instructor=cls.instructor_user
         )
         
         # Create order
-        self.order = Order.objects.create(
-            user=self.student_user,
+        cls.order = Order.objects.create(
+            user=cls.student_user,
             order_number='ORD20240101TEST001',
             subtotal=Decimal('100000.00'),
             total_amount=Decimal('100000.00'),
-            billing_email=self.student_user.email,
-            billing_name=self.student_user.full_name or self.student_user.username
+            billing_email=cls.student_user.email,
+            billing_name=cls.student_user.full_name or cls.student_user.username
         )
         
         # Create payment
-        self.payment = Payment.objects.create(
-            order=self.order,
+        cls.payment = Payment.objects.create(
+            order=cls.order,
             payment_id='PAY20240101TEST001',
             amount=Decimal('100000.00'),
-            currency='IDR',
+            currency=Currency.objects.get(alpha3='IDR'),
             payment_method=Payment.PaymentMethod.CREDIT_CARD,
             status=Payment.PaymentStatus.COMPLETED
         )
         
         # Create revenue
         # First create an order item since it's required
-        order_item = self.order.items.create(  # type: ignore
-            course=self.course,
+        cls.order_item = cls.order.items.create(  # type: ignore
+            course=cls.course,
             unit_price=Decimal('100000.00'),
             discount_amount=Decimal('0.00'),
-            total_price=Decimal('100000.00'),
-            course_title=self.course.title,
-            instructor_name=self.instructor_user.full_name or self.instructor_user.username
+            course_title=cls.course.title,
+            instructor_name=cls.instructor_user.full_name or cls.instructor_user.username
         )
         
-        self.revenue = Revenue.objects.create(
-            order_item=order_item,
-            instructor=self.instructor_user,
+        cls.revenue = Revenue.objects.create(
+            order_item=cls.order_item,
+            instructor=cls.instructor_user,
             gross_amount=Decimal('100000.00'),
             platform_commission=Decimal('10000.00'),
             instructor_earnings=Decimal('90000.00'),
@@ -95,18 +100,18 @@ class FinancialManagementTestCase(APITestCase):
         )
         
         # Create payout
-        self.payout = InstructorPayout.objects.create(
-            instructor=self.instructor_user,
+        cls.payout = InstructorPayout.objects.create(
+            instructor=cls.instructor_user,
             period_start=timezone.now().date() - timedelta(days=30),
             period_end=timezone.now().date(),
             gross_revenue=Decimal('90000.00'),
             platform_commission=Decimal('0.00'),
             commission_rate=Decimal('0.0000'),
-            net_amount=Decimal('90000.00'),
             payout_method='bank_transfer'
         )
-        
-        # Set up API clients
+
+    def setUp(self):
+        """Set up API clients"""
         self.admin_client = APIClient()
         self.admin_client.force_authenticate(user=self.admin_user)
         
@@ -165,6 +170,25 @@ class FinancialManagementTestCase(APITestCase):
         self.assertIn('report_type', data)
         self.assertIn('data', data)
 
+    def test_admin_revenue_report_csv_export(self):
+        """Test staff can download the revenue report as CSV"""
+        staff_user = User.objects.create_user(  # type: ignore
+            email='staff@example.com',
+            username='staff',
+            password='testpass123',
+            is_staff=True
+        )
+        self.admin_client.force_authenticate(user=staff_user)
+        response = self.admin_client.get('/api/v1/payments/admin/reports/', {
+            'report_type': 'revenue',
+            'format': 'csv'
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)  # type: ignore
+        self.assertEqual(response['Content-Type'], 'text/csv')
+
+        lines = b''.join(response.streaming_content).decode().splitlines()  # type: ignore
+        self.assertEqual(lines[0], 'date,revenue,orders,courses')
+
     def test_admin_payout_processing(self):
         """Test admin can process instructor payouts"""
         response = self.admin_client.post('/api/v1/payments/admin/payouts/process/', {
@@ -183,6 +207,19 @@ class FinancialManagementTestCase(APITestCase):
         self.assertIn('message', data)
         self.assertIn('amount', data)
 
+    def test_order_item_total_price_is_generated(self):
+        """Test the database computes total_price from unit price and discount"""
+        self.order_item.refresh_from_db()
+        self.assertEqual(
+            self.order_item.total_price,
+            self.order_item.unit_price - self.order_item.discount_amount
+        )
+
+        self.order_item.discount_amount = Decimal('25000.00')
+        self.order_item.save()
+        self.order_item.refresh_from_db()
+        self.assertEqual(self.order_item.total_price, Decimal('75000.00'))
+
     def test_date_filtering(self):
         """Test date filtering functionality"""
         from payments.financial_views import get_date_filters
@@ -197,11 +234,542 @@ class FinancialManagementTestCase(APITestCase):
         self.assertIn('created_at__gte', filters)
         self.assertIn('created_at__lt', filters)
 
-    def tearDown(self):
-        """Clean up test data"""
-        InstructorPayout.objects.all().delete()
-        Revenue.objects.all().delete()
-        Payment.objects.all().delete()
-        Order.objects.all().delete()
-        Course.objects.all().delete()
-        User.objects.all().delete()
\ No newline at end of file
+
+class CouponUsageCountTestCase(TestCase):
+    """Test the database-maintained coupon usage counter"""
+
+    def test_usage_insert_increments_current_uses(self):
+        """Test recording a coupon usage bumps current_uses"""
+        user = User.objects.create_user(  # type: ignore
+            email='buyer@example.com',
+            username='buyer',
+            password='testpass123'
+        )
+        coupon = Coupon.objects.create(
+            code='SAVE10',
+            name='Save 10',
+            coupon_type=Coupon.CouponType.PERCENTAGE,
+            discount_percentage=Decimal('10.00'),
+            valid_from=timezone.now() - timedelta(days=1),
+            valid_until=timezone.now() + timedelta(days=1),
+            created_by=user
+        )
+        order = Order.objects.create(
+            user=user,
+            subtotal=Decimal('100000.00'),
+            total_amount=Decimal('90000.00'),
+            billing_email=user.email,
+            billing_name=user.username
+        )
+
+        CouponUsage.objects.create(
+            coupon=coupon,
+            user=user,
+            order=order,
+            discount_amount=Decimal('10000.00')
+        )
+
+        coupon.refresh_from_db()
+        self.assertEqual(coupon.current_uses, 1)
+
+    def test_record_usage_invalidates_cached_coupon(self):
+        """Test the cached coupon is refreshed after a redemption"""
+        user = User.objects.create_user(  # type: ignore
+            email='cached@example.com',
+            username='cached',
+            password='testpass123'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            coupon = Coupon.objects.create(
+                code='CACHED10',
+                name='Cached 10',
+                coupon_type=Coupon.CouponType.PERCENTAGE,
+                discount_percentage=Decimal('10.00'),
+                valid_from=timezone.now() - timedelta(days=1),
+                valid_until=timezone.now() + timedelta(days=1),
+                created_by=user
+            )
+        order = Order.objects.create(
+            user=user,
+            subtotal=Decimal('100000.00'),
+            total_amount=Decimal('90000.00'),
+            billing_email=user.email,
+            billing_name=user.username
+        )
+        self.assertEqual(Coupon.get_cached('CACHED10').current_uses, 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            coupon.record_usage(user, order, Decimal('10000.00'))
+
+        self.assertEqual(Coupon.get_cached('CACHED10').current_uses, 1)
+
+
+    def test_editing_stale_coupon_keeps_current_uses(self):
+        """Test saving a coupon loaded before a redemption does not undo the count"""
+        user = User.objects.create_user(  # type: ignore
+            email='editor@example.com',
+            username='editor',
+            password='testpass123'
+        )
+        coupon = Coupon.objects.create(
+            code='STALE10',
+            name='Stale 10',
+            coupon_type=Coupon.CouponType.PERCENTAGE,
+            discount_percentage=Decimal('10.00'),
+            valid_from=timezone.now() - timedelta(days=1),
+            valid_until=timezone.now() + timedelta(days=1),
+            created_by=user
+        )
+        order = Order.objects.create(
+            user=user,
+            subtotal=Decimal('100000.00'),
+            total_amount=Decimal('90000.00'),
+            billing_email=user.email,
+            billing_name=user.username
+        )
+        stale = Coupon.objects.get(pk=coupon.pk)
+
+        CouponUsage.objects.create(
+            coupon=coupon,
+            user=user,
+            order=order,
+            discount_amount=Decimal('10000.00')
+        )
+        stale.name = 'Renamed 10'
+        stale.save()
+
+        coupon.refresh_from_db()
+        self.assertEqual(coupon.name, 'Renamed 10')
+        self.assertEqual(coupon.current_uses, 1)
+
+    def test_serializer_cannot_set_current_uses(self):
+        """Test the coupon serializer ignores a written current_uses"""
+        from .serializers import CouponSerializer
+
+        user = User.objects.create_user(  # type: ignore
+            email='patcher@example.com',
+            username='patcher',
+            password='testpass123'
+        )
+        coupon = Coupon.objects.create(
+            code='PATCH10',
+            name='Patch 10',
+            coupon_type=Coupon.CouponType.PERCENTAGE,
+            discount_percentage=Decimal('10.00'),
+            valid_from=timezone.now() - timedelta(days=1),
+            valid_until=timezone.now() + timedelta(days=1),
+            created_by=user
+        )
+
+        serializer = CouponSerializer(coupon, data={'current_uses': 99}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        coupon.refresh_from_db()
+        self.assertEqual(coupon.current_uses, 0)
+
+
+class CartBulkAddTestCase(TestCase):
+    """Test adding several items to a cart at once"""
+
+    def test_bulk_add_skips_items_already_in_cart(self):
+        """Test bulk_add inserts new courses and ignores duplicates"""
+        user = User.objects.create_user(  # type: ignore
+            email='shopper@example.com',
+            username='shopper',
+            password='testpass123'
+        )
+        first = Course.objects.create(
+            title='First Course',
+            slug='first-course',
+            description='First course description',
+            price=Decimal('100000.00'),
+            instructor=user
+        )
+        second = Course.objects.create(
+            title='Second Course',
+            slug='second-course',
+            description='Second course description',
+            price=Decimal('50000.00'),
+            instructor=user
+        )
+        cart = ShoppingCart.objects.create(user=user)
+
+        CartItem.objects.bulk_add(cart, [(first, None)])
+        CartItem.objects.bulk_add(cart, [(first, None), (second, None)])
+
+        self.assertEqual(cart.items.count(), 2)
+        self.assertEqual(cart.total_amount, Decimal('150000.00'))
+
+
+class PaymentCompletionTestCase(APITestCase):
+    """Test side effects of completing an order payment"""
+
+    def test_payment_enrollments_update_platform_metrics(self):
+        """Test enrollments created at checkout are counted in platform metrics"""
+        from analytics.models import PlatformMetrics
+
+        instructor = User.objects.create_user(  # type: ignore
+            email='teacher@example.com',
+            username='teacher',
+            password='testpass123'
+        )
+        student = User.objects.create_user(  # type: ignore
+            email='learner@example.com',
+            username='learner',
+            password='testpass123'
+        )
+        courses = [
+            Course.objects.create(
+                title=f'Checkout Course {i}',
+                slug=f'checkout-course-{i}',
+                description='Checkout course description',
+                price=Decimal('100000.00'),
+                instructor=instructor
+            )
+            for i in range(2)
+        ]
+        cart = ShoppingCart.objects.create(user=student)
+        CartItem.objects.bulk_add(cart, [(course, None) for course in courses])
+
+        client = APIClient()
+        client.force_authenticate(user=student)
+        response = client.post('/api/v1/payments/order/create/', {
+            'billing_name': 'Learner',
+            'billing_email': student.email
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)  # type: ignore
+
+        order = Order.objects.get(user=student)
+        response = client.post(f'/api/v1/payments/order/{order.id}/pay/', {
+            'payment_method': Payment.PaymentMethod.CREDIT_CARD
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)  # type: ignore
+        self.assertEqual(response.data['payment']['currency'], 'USD')  # type: ignore
+
+        metrics = PlatformMetrics.objects.get(date=timezone.now().date())
+        self.assertEqual(metrics.new_enrollments, 2)
+
+
+class AdminReportTestCase(APITestCase):
+    """Test the admin financial report figures across two monthly buckets"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up orders, refunds, payouts and enrollments in January and February 2024"""
+        cls.staff_user = User.objects.create_user(  # type: ignore
+            email='reports@example.com',
+            username='reports',
+            password='testpass123',
+            is_staff=True
+        )
+        instructor = User.objects.create_user(  # type: ignore
+            email='author@example.com',
+            username='author',
+            password='testpass123',
+            full_name='Ada Author'
+        )
+        student = User.objects.create_user(  # type: ignore
+            email='reader@example.com',
+            username='reader',
+            password='testpass123'
+        )
+        cls.first_course = Course.objects.create(
+            title='First Report Course',
+            slug='first-report-course',
+            description='First report course description',
+            price=Decimal('100.00'),
+            instructor=instructor
+        )
+        cls.second_course = Course.objects.create(
+            title='Second Report Course',
+            slug='second-report-course',
+            description='Second report course description',
+            price=Decimal('50.00'),
+            instructor=instructor
+        )
+        Course.objects.create(
+            title='Unsold Report Course',
+            slug='unsold-report-course',
+            description='Unsold report course description',
+            price=Decimal('75.00'),
+            instructor=instructor
+        )
+
+        def order(when, courses, order_status=Order.OrderStatus.COMPLETED):
+            total = sum(course.price for course in courses)
+            new_order = Order.objects.create(
+                user=student,
+                subtotal=total,
+                total_amount=total,
+                status=order_status,
+                billing_email=student.email,
+                billing_name=student.username
+            )
+            for course in courses:
+                new_order.items.create(  # type: ignore
+                    course=course,
+                    unit_price=course.price,
+                    course_title=course.title,
+                    instructor_name=instructor.username
+                )
+            Order.objects.filter(pk=new_order.pk).update(created_at=when)
+            return new_order
+
+        first_order = order(cls.at(2024, 1, 15), [cls.first_course, cls.second_course])
+        order(cls.at(2024, 1, 20), [cls.first_course])
+        third_order = order(cls.at(2024, 2, 10), [cls.second_course])
+        # Neither counts: one is still pending, the other falls after end_date
+        order(cls.at(2024, 2, 12), [cls.first_course], Order.OrderStatus.PENDING)
+        order(cls.at(2024, 3, 1), [cls.first_course])
+
+        def refund(when, refunded_order, amount, refund_status):
+            payment = Payment.objects.create(
+                order=refunded_order,
+                amount=refunded_order.total_amount,
+                payment_method=Payment.PaymentMethod.CREDIT_CARD,
+                status=Payment.PaymentStatus.COMPLETED
+            )
+            new_refund = Refund.objects.create(
+                payment=payment,
+                order=refunded_order,
+                amount=amount,
+                reason=Refund.RefundReason.CUSTOMER_REQUEST,
+                status=refund_status,
+                requested_by=student
+            )
+            Refund.objects.filter(pk=new_refund.pk).update(created_at=when)
+
+        refund(cls.at(2024, 1, 21), first_order, Decimal('50.00'), Refund.RefundStatus.REQUESTED)
+        refund(cls.at(2024, 1, 22), first_order, Decimal('100.00'), Refund.RefundStatus.REJECTED)
+        refund(cls.at(2024, 2, 15), third_order, Decimal('50.00'), Refund.RefundStatus.COMPLETED)
+
+        def payout(when, period_start, gross, payout_status):
+            new_payout = InstructorPayout.objects.create(
+                instructor=instructor,
+                period_start=period_start,
+                period_end=period_start + timedelta(days=27),
+                gross_revenue=gross,
+                platform_commission=gross / 10,
+                commission_rate=Decimal('0.1000'),
+                payout_method='bank_transfer',
+                status=payout_status
+            )
+            InstructorPayout.objects.filter(pk=new_payout.pk).update(created_at=when)
+
+        payout(cls.at(2024, 1, 31), date(2023, 12, 1), Decimal('1000.00'), InstructorPayout.PayoutStatus.COMPLETED)
+        payout(cls.at(2024, 2, 5), date(2024, 1, 1), Decimal('500.00'), InstructorPayout.PayoutStatus.COMPLETED)
+        payout(cls.at(2024, 2, 6), date(2024, 1, 29), Decimal('300.00'), InstructorPayout.PayoutStatus.PENDING)
+
+        for course, when in ((cls.first_course, cls.at(2024, 1, 15)), (cls.second_course, cls.at(2024, 3, 2))):
+            enrollment = Enrollment.objects.create(student=student, course=course)
+            Enrollment.objects.filter(pk=enrollment.pk).update(enrolled_at=when)
+
+    @staticmethod
+    def at(year, month, day):
+        """Midday on the given date in the current timezone"""
+        return timezone.make_aware(datetime(year, month, day, 12))
+
+    def setUp(self):
+        """Authenticate as a staff user"""
+        self.client.force_authenticate(user=self.staff_user)
+
+    def report(self, report_type, **params):
+        """Fetch a monthly report for January and February 2024"""
+        response = self.client.get('/api/v1/payments/admin/reports/', {
+            'report_type': report_type,
+            'period': 'monthly',
+            'start_date': '2024-01-01',
+            'end_date': '2024-02-29',
+            **params
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)  # type: ignore
+        return response
+
+    def test_revenue_report(self):
+        """Test revenue, order and distinct course counts per month"""
+        data = self.report('revenue').data['data']  # type: ignore
+        self.assertEqual(data, [
+            {'date': date(2024, 1, 1), 'revenue': Decimal('250.00'), 'orders': 2, 'courses': 2},
+            {'date': date(2024, 2, 1), 'revenue': Decimal('50.00'), 'orders': 1, 'courses': 1},
+        ])
+
+    def test_payout_report(self):
+        """Test only completed payouts count towards the monthly totals"""
+        data = self.report('payouts').data['data']  # type: ignore
+        self.assertEqual(data, [
+            {'period': date(2024, 1, 1), 'total_payouts': Decimal('900.00'), 'instructors_paid': 1, 'completed_payouts': 1},
+            {'period': date(2024, 2, 1), 'total_payouts': Decimal('450.00'), 'instructors_paid': 1, 'completed_payouts': 1},
+        ])
+
+    def test_refund_report(self):
+        """Test rejected refunds are skipped and the rate uses the same month's completed orders"""
+        data = self.report('refunds').data['data']  # type: ignore
+        self.assertEqual(data, [
+            {'period': date(2024, 1, 1), 'total_refunds': Decimal('50.00'), 'refund_count': 1, 'refund_rate': '50.00%'},
+            {'period': date(2024, 2, 1), 'total_refunds': Decimal('50.00'), 'refund_count': 1, 'refund_rate': '100.00%'},
+        ])
+
+    def test_course_performance_report(self):
+        """Test course sales and enrollments are totalled separately within the range"""
+        data = self.report('courses').data['data']  # type: ignore
+        self.assertEqual(data, [
+            {
+                'course_id': self.first_course.pk,
+                'title': 'First Report Course',
+                'revenue': Decimal('200.00'),
+                'enrollments': 1,
+                'instructor': 'Ada Author'
+            },
+            {
+                'course_id': self.second_course.pk,
+                'title': 'Second Report Course',
+                'revenue': Decimal('100.00'),
+                'enrollments': 0,
+                'instructor': 'Ada Author'
+            },
+        ])
+
+    def test_course_performance_report_csv_export(self):
+        """Test the course report streams one CSV line per course"""
+        response = self.report('courses', format='csv')
+        lines = b''.join(response.streaming_content).decode().splitlines()  # type: ignore
+        header, *rows = csv.reader(lines)
+        self.assertEqual(header, ['course_id', 'title', 'revenue', 'enrollments', 'instructor'])
+        self.assertEqual(
+            [(int(course_id), title, Decimal(revenue), int(enrollments), instructor)
+             for course_id, title, revenue, enrollments, instructor in rows],
+            [
+                (self.first_course.pk, 'First Report Course', Decimal('200.00'), 1, 'Ada Author'),
+                (self.second_course.pk, 'Second Report Course', Decimal('100.00'), 0, 'Ada Author'),
+            ]
+        )
+
+
+class PayoutProcessingTestCase(APITestCase):
+    """Test admin payout processing against an instructor's revenue"""
+
+    period_start = date(2024, 3, 1)
+    period_end = date(2024, 3, 31)
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up revenue on both edges of a March 2024 payout period"""
+        cls.staff_user = User.objects.create_user(  # type: ignore
+            email='payouts@example.com',
+            username='payouts',
+            password='testpass123',
+            is_staff=True
+        )
+        cls.instructor = User.objects.create_user(  # type: ignore
+            email='payee@example.com',
+            username='payee',
+            password='testpass123'
+        )
+        cls.instructor.role = User.UserRole.INSTRUCTOR  # type: ignore
+        cls.instructor.save()
+        student = User.objects.create_user(  # type: ignore
+            email='payer@example.com',
+            username='payer',
+            password='testpass123'
+        )
+        order = Order.objects.create(
+            user=student,
+            subtotal=Decimal('400.00'),
+            total_amount=Decimal('400.00'),
+            status=Order.OrderStatus.COMPLETED,
+            billing_email=student.email,
+            billing_name=student.username
+        )
+
+        def revenue(slug, when):
+            course = Course.objects.create(
+                title=slug,
+                slug=slug,
+                description='Payout course description',
+                price=Decimal('100.00'),
+                instructor=cls.instructor
+            )
+            item = order.items.create(  # type: ignore
+                course=course,
+                unit_price=course.price,
+                course_title=course.title,
+                instructor_name=cls.instructor.username
+            )
+            new_revenue = Revenue.objects.create(
+                order_item=item,
+                instructor=cls.instructor,
+                gross_amount=Decimal('100.00'),
+                platform_commission=Decimal('10.00'),
+                instructor_earnings=Decimal('90.00'),
+                commission_rate=Decimal('0.1000')
+            )
+            Revenue.objects.filter(pk=new_revenue.pk).update(created_at=when)
+            return new_revenue
+
+        def at(day, hour=0):
+            return timezone.make_aware(datetime.combine(day, time(hour)))
+
+        cls.first_day = revenue('payout-first-day', at(cls.period_start))
+        cls.last_day = revenue('payout-last-day', at(cls.period_end, 23))
+        cls.before = revenue('payout-before', at(cls.period_start - timedelta(days=1), 23))
+        cls.after = revenue('payout-after', at(cls.period_end + timedelta(days=1)))
+
+    def setUp(self):
+        """Authenticate as a staff user"""
+        self.client.force_authenticate(user=self.staff_user)
+
+    def payout_data(self, **overrides):
+        """Request body paying the instructor for March 2024"""
+        return {
+            'instructor_id': self.instructor.id,
+            'period_start': self.period_start.isoformat(),
+            'period_end': self.period_end.isoformat(),
+            'amount': '180.00',
+            'payout_method': 'bank_transfer',
+            'notes': 'March payout',
+            **overrides
+        }
+
+    def test_payout_marks_revenue_in_period_paid(self):
+        """Test the payout is completed and covers revenue through the whole of period_end"""
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.post('/api/v1/payments/admin/payouts/process/', self.payout_data())
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)  # type: ignore
+        self.assertEqual(len(callbacks), 1)
+
+        payout = InstructorPayout.objects.get(payout_id=response.data['payout_id'])  # type: ignore
+        self.assertEqual(payout.status, InstructorPayout.PayoutStatus.COMPLETED)
+        self.assertEqual(payout.processed_by, self.staff_user)
+        self.assertEqual(response.data['amount'], payout.gross_revenue - payout.platform_commission)  # type: ignore
+        self.assertEqual(response.data['amount'], Decimal('180.00'))  # type: ignore
+
+        for revenue in (self.first_day, self.last_day):
+            revenue.refresh_from_db()
+            self.assertTrue(revenue.is_paid)
+            self.assertEqual(revenue.payout, payout)
+            self.assertIsNotNone(revenue.paid_at)
+        for revenue in (self.before, self.after):
+            revenue.refresh_from_db()
+            self.assertFalse(revenue.is_paid)
+            self.assertIsNone(revenue.payout)
+            self.assertIsNone(revenue.paid_at)
+
+    def test_payout_rejects_invalid_instructor(self):
+        """Test a user who is not an instructor cannot be paid out"""
+        response = self.client.post(
+            '/api/v1/payments/admin/payouts/process/',
+            self.payout_data(instructor_id=self.staff_user.id)
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)  # type: ignore
+        self.assertIn('instructor_id', response.data)  # type: ignore
+        self.assertFalse(InstructorPayout.objects.exists())
+
+    def test_payout_rejects_missing_field(self):
+        """Test a payout request without a period end is refused"""
+        data = self.payout_data()
+        del data['period_end']
+        response = self.client.post('/api/v1/payments/admin/payouts/process/', data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)  # type: ignore
+        self.assertIn('period_end', response.data)  # type: ignore
+        self.assertFalse(InstructorPayout.objects.exists())
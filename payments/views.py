@@ -1,10 +1,19 @@
 from rest_framework import generics, permissions, status, serializers
-from rest_framework import generics, permissions, status, serializers
 from rest_framework.response import Response
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.renderers import JSONRenderer
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from django.db.models import Sum, Count, Q, Avg
+from django.db import transaction
+from django.db.models import (
+    Sum, Count, Q, Avg, F, Exists, OuterRef, Subquery, Value, DateField
+)
+from django.db.models.functions import (
+    Coalesce, NullIf, TruncDay, TruncWeek, TruncMonth, TruncQuarter, TruncYear
+)
 from django.utils import timezone
+from datetime import date, datetime, time, timedelta
 from decimal import Decimal
 
 # drf-spectacular imports
@@ -13,16 +22,18 @@ from drf_spectacular.types import OpenApiTypes
 
 from .models import (
     ShoppingCart, CartItem, Order, OrderItem, Payment, Refund,
-    InstructorPayout, Revenue, Coupon, CouponUsage
+    InstructorPayout, Revenue, Coupon,
+    refresh_instructor_unpaid_totals
 )
+from .renderers import CSVRenderer, iter_csv
 from .serializers import (
     ShoppingCartSerializer, CartItemSerializer, OrderSerializer,
     OrderDetailSerializer, OrderCreateSerializer, PaymentSerializer,
     PaymentCreateSerializer, RefundSerializer, RefundCreateSerializer,
     CouponSerializer, CouponCreateSerializer, InstructorPayoutSerializer,
-    RevenueSerializer
+    PayoutProcessSerializer, RevenueSerializer
 )
-from courses.models import Course, Enrollment
+from courses.models import Course, CourseBatch, Enrollment
 from accounts.models import User
 
 
@@ -99,7 +110,10 @@ class ShoppingCartView(generics.RetrieveAPIView):
     queryset = ShoppingCart.objects.all()
     
     def get_object(self) -> ShoppingCart:  # type: ignore[override]
-        cart, created = ShoppingCart.objects.get_or_create(user=self.request.user)
+        # A newly created cart has no annotations and falls back to the aggregate query
+        cart, created = ShoppingCart.objects.with_items().with_summary().get_or_create(
+            user=self.request.user
+        )
         return cart
 
 
@@ -194,12 +208,8 @@ class CartItemCreateView(generics.CreateAPIView):
     def perform_create(self, serializer):
         course = serializer.validated_data['course']
         
-        # Check if user is already enrolled
-        if Enrollment.objects.filter(
-            student=self.request.user,
-            course=course,
-            is_active=True
-        ).exists():
+        # Loaded with the course by PurchasableCourseField
+        if course.is_enrolled:
             raise serializers.ValidationError("You are already enrolled in this course")
         
         serializer.save()
@@ -218,12 +228,11 @@ class CartItemDeleteView(generics.DestroyAPIView):
 @permission_classes([permissions.IsAuthenticated])
 def clear_cart(request):
     """Clear all items from shopping cart"""
-    try:
-        cart = ShoppingCart.objects.get(user=request.user)
-        cart.clear()
-        return Response({'message': 'Cart cleared successfully'})
-    except ShoppingCart.DoesNotExist:
+    # One DELETE; cart items have no dependents, so nothing is loaded first
+    deleted, _ = CartItem.objects.filter(cart__user=request.user).delete()
+    if not deleted:
         return Response({'message': 'Cart is already empty'})
+    return Response({'message': 'Cart cleared successfully'})
 
 
 @extend_schema(
@@ -323,7 +332,7 @@ def validate_coupon(request):
         )
     
     try:
-        coupon = Coupon.objects.get(code=coupon_code)
+        coupon = Coupon.get_cached(coupon_code)
         
         if not coupon.is_valid:
             return Response(
@@ -332,12 +341,7 @@ def validate_coupon(request):
             )
         
         # Check usage limits
-        user_usage_count = CouponUsage.objects.filter(
-            coupon=coupon,
-            user=request.user
-        ).count()
-        
-        if user_usage_count >= coupon.max_uses_per_user:
+        if not coupon.has_uses_left_for(request.user):
             return Response(
                 {'error': 'Coupon usage limit exceeded'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -345,9 +349,15 @@ def validate_coupon(request):
         
         # Get cart total to calculate discount
         try:
-            cart = ShoppingCart.objects.get(user=request.user)
+            cart = ShoppingCart.objects.with_summary().get(user=request.user)
             cart_total = cart.total_amount
             
+            if not coupon.applies_to(cart.items.values_list('course_id', flat=True)):
+                return Response(
+                    {'error': 'Coupon does not apply to any course in your cart'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
             if cart_total < coupon.minimum_amount:
                 return Response(
                     {'error': f'Minimum order amount of ${coupon.minimum_amount} required'},
@@ -399,9 +409,8 @@ class OrderListView(generics.ListAPIView):
     queryset = Order.objects.all()
     
     def get_queryset(self):  # type: ignore[override]
-        return Order.objects.filter(
-            user=self.request.user
-        ).prefetch_related('items').order_by('-created_at')
+        queryset = Order.objects.for_list().filter(user=self.request.user)
+        return self.get_serializer_class().optimize_queryset(queryset).order_by('-created_at')
 
 
 class OrderDetailView(generics.RetrieveAPIView):
@@ -411,7 +420,8 @@ class OrderDetailView(generics.RetrieveAPIView):
     queryset = Order.objects.all()
     
     def get_queryset(self):  # type: ignore[override]
-        return Order.objects.filter(user=self.request.user).prefetch_related('items')
+        queryset = Order.objects.filter(user=self.request.user)
+        return self.get_serializer_class().optimize_queryset(queryset)
 
 
 @extend_schema(
@@ -534,10 +544,15 @@ class PaymentCreateView(generics.CreateAPIView):
     serializer_class = PaymentCreateSerializer
     permission_classes = [permissions.IsAuthenticated]
     
+    @transaction.atomic
     def create(self, request, *args, **kwargs):
         order_id = kwargs.get('order_id')
+        # The order row stays locked until the payment outcome is committed,
+        # so two concurrent requests cannot both pay the same pending order.
+        # Items are prefetched once for the completion signal receivers,
+        # the enrollments and the response
         order = get_object_or_404(
-            Order,
+            Order.objects.select_for_update().with_items(),
             id=order_id,
             user=request.user,
             status=Order.OrderStatus.PENDING
@@ -555,20 +570,20 @@ class PaymentCreateView(generics.CreateAPIView):
         success = self._process_payment(payment, request.data)
         
         if success:
-            payment.status = Payment.PaymentStatus.COMPLETED
-            payment.processed_at = timezone.now()
-            payment.save()
+            # Served from the prefetch, with course, instructor and batch
+            items = list(order.items.all())
             
-            # Complete order
-            order.status = Order.OrderStatus.COMPLETED
-            order.completed_at = timezone.now()
-            order.save()
+            payment.mark_processed()
             
-            # Create enrollments
-            self._create_enrollments(order)
+            # Create enrollments before completing the order, so the
+            # analytics order completion receiver counts them
+            self._create_enrollments(order, items)
+            
+            # Complete order
+            order.mark_completed()
             
             # Create revenue records
-            self._create_revenue_records(order)
+            Revenue.objects.create_for_order(order, items)
             
             return Response({
                 'message': 'Payment processed successfully',
@@ -578,10 +593,10 @@ class PaymentCreateView(generics.CreateAPIView):
         else:
             payment.status = Payment.PaymentStatus.FAILED
             payment.failure_reason = 'Payment processing failed'
-            payment.save()
+            payment.save(update_fields=['status', 'failure_reason'])
             
             order.status = Order.OrderStatus.FAILED
-            order.save()
+            order.save(update_fields=['status', 'updated_at'])
             
             return Response(
                 {'error': 'Payment processing failed'},
@@ -594,46 +609,38 @@ class PaymentCreateView(generics.CreateAPIView):
         # For demo purposes, assume all payments succeed
         return True
     
-    def _create_enrollments(self, order):
+    def _create_enrollments(self, order, items):
         """Create course enrollments for completed order"""
-        for item in order.items.all():
-            enrollment, created = Enrollment.objects.get_or_create(
+        existing = set(Enrollment.objects.filter(
+            student=order.user,
+            course_id__in=[item.course_id for item in items]
+        ).values_list('course_id', flat=True))
+        new_items = [item for item in items if item.course_id not in existing]
+        if not new_items:
+            return
+        
+        # bulk_create sends no post_save; enrollment metrics are refreshed by
+        # the order completion signal, which the caller triggers afterwards
+        Enrollment.objects.bulk_create([
+            Enrollment(
                 student=order.user,
-                course=item.course,
-                defaults={
-                    'batch': item.batch,
-                    'amount_paid': item.total_price,
-                    'payment_method': 'online',
-                    'transaction_id': order.order_number
-                }
+                course_id=item.course_id,
+                batch_id=item.batch_id,
+                amount_paid=item.total_price,
+                payment_method='online',
+                transaction_id=order.order_number
             )
-            
-            # Update course enrollment count
-            if created:
-                item.course.total_enrollments += 1
-                item.course.save(update_fields=['total_enrollments'])
-                
-                # Update batch enrollment count for structured courses
-                if item.batch:
-                    item.batch.current_enrollments += 1
-                    item.batch.save(update_fields=['current_enrollments'])
-    
-    def _create_revenue_records(self, order):
-        """Create revenue tracking records"""
-        from django.conf import settings
-        commission_rate = Decimal(str(settings.PLATFORM_COMMISSION_RATE))
+            for item in new_items
+        ], ignore_conflicts=True)
         
-        for item in order.items.all():
-            platform_commission = item.total_price * commission_rate
-            instructor_earnings = item.total_price - platform_commission
-            
-            Revenue.objects.create(
-                order_item=item,
-                instructor=item.course.instructor,
-                gross_amount=item.total_price,
-                platform_commission=platform_commission,
-                instructor_earnings=instructor_earnings,
-                commission_rate=commission_rate
+        # Update course and batch enrollment counts
+        Course.objects.filter(
+            id__in=[item.course_id for item in new_items]
+        ).update(total_enrollments=F('total_enrollments') + 1)
+        batch_ids = [item.batch_id for item in new_items if item.batch_id]
+        if batch_ids:
+            CourseBatch.objects.filter(id__in=batch_ids).update(
+                current_enrollments=F('current_enrollments') + 1
             )
 
 
@@ -644,9 +651,8 @@ class PaymentListView(generics.ListAPIView):
     queryset = Payment.objects.all()
     
     def get_queryset(self):  # type: ignore[override]
-        return Payment.objects.filter(
-            order__user=self.request.user
-        ).select_related('order').order_by('-created_at')
+        queryset = Payment.objects.for_list().filter(order__user=self.request.user)
+        return self.get_serializer_class().optimize_queryset(queryset).order_by('-created_at')
 
 
 class RefundRequestView(generics.CreateAPIView):
@@ -656,18 +662,20 @@ class RefundRequestView(generics.CreateAPIView):
     
     def create(self, request, *args, **kwargs):
         payment_id = kwargs.get('payment_id')
+        # The open-refund check and the order come back with the payment row
+        open_refunds = Refund.objects.filter(
+            payment=OuterRef('pk'),
+            status__in=[Refund.RefundStatus.REQUESTED, Refund.RefundStatus.PROCESSING]
+        )
         payment = get_object_or_404(
-            Payment,
+            Payment.objects.select_related('order').annotate(has_open_refund=Exists(open_refunds)),
             id=payment_id,
             order__user=request.user,
             status=Payment.PaymentStatus.COMPLETED
         )
         
         # Check if refund already requested
-        if Refund.objects.filter(
-            payment=payment,
-            status__in=[Refund.RefundStatus.REQUESTED, Refund.RefundStatus.PROCESSING]
-        ).exists():
+        if payment.has_open_refund:
             return Response(
                 {'error': 'Refund already requested for this payment'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -697,9 +705,8 @@ class RefundListView(generics.ListAPIView):
     queryset = Refund.objects.all()
     
     def get_queryset(self):  # type: ignore[override]
-        return Refund.objects.filter(
-            order__user=self.request.user
-        ).select_related('order', 'requested_by', 'processed_by').order_by('-created_at')
+        queryset = Refund.objects.filter(order__user=self.request.user)
+        return self.get_serializer_class().optimize_queryset(queryset).order_by('-created_at')
 
 
 # Instructor Views
@@ -714,9 +721,8 @@ class InstructorRevenueView(generics.ListAPIView):
         if getattr(self.request.user, 'role', None) != User.UserRole.INSTRUCTOR:
             return Revenue.objects.none()
         
-        return Revenue.objects.filter(
-            instructor=self.request.user
-        ).select_related('order_item', 'instructor').order_by('-created_at')
+        queryset = Revenue.objects.filter(instructor=self.request.user)
+        return self.get_serializer_class().optimize_queryset(queryset).order_by('-created_at')
 
 
 class InstructorPayoutListView(generics.ListAPIView):
@@ -729,9 +735,8 @@ class InstructorPayoutListView(generics.ListAPIView):
         if getattr(self.request.user, 'role', None) != User.UserRole.INSTRUCTOR:
             return InstructorPayout.objects.none()
         
-        return InstructorPayout.objects.filter(
-            instructor=self.request.user
-        ).order_by('-created_at')
+        queryset = InstructorPayout.objects.filter(instructor=self.request.user)
+        return self.get_serializer_class().optimize_queryset(queryset).order_by('-created_at')
 
 
 @extend_schema(
@@ -796,22 +801,20 @@ def instructor_earnings_summary(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    revenues = Revenue.objects.filter(instructor=request.user)
-    
-    summary = {
-        'total_revenue': revenues.aggregate(Sum('gross_amount'))['gross_amount__sum'] or 0,
-        'total_earnings': revenues.aggregate(Sum('instructor_earnings'))['instructor_earnings__sum'] or 0,
-        'platform_commission': revenues.aggregate(Sum('platform_commission'))['platform_commission__sum'] or 0,
-        'paid_earnings': revenues.filter(is_paid=True).aggregate(Sum('instructor_earnings'))['instructor_earnings__sum'] or 0,
-        'pending_earnings': revenues.filter(is_paid=False).aggregate(Sum('instructor_earnings'))['instructor_earnings__sum'] or 0,
-        'total_sales': revenues.count(),
-        'this_month_earnings': revenues.filter(
-            created_at__month=timezone.now().month,
-            created_at__year=timezone.now().year
-        ).aggregate(Sum('instructor_earnings'))['instructor_earnings__sum'] or 0
-    }
+    month_start = timezone.localtime().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     
-    return Response(summary)
+    # All figures come from one scan of the instructor's revenue rows
+    summary = Revenue.objects.filter(instructor=request.user).aggregate(
+        total_revenue=Sum('gross_amount'),
+        total_earnings=Sum('instructor_earnings'),
+        platform_commission=Sum('platform_commission'),
+        paid_earnings=Sum('instructor_earnings', filter=Q(is_paid=True)),
+        pending_earnings=Sum('instructor_earnings', filter=Q(is_paid=False)),
+        total_sales=Count('id'),
+        this_month_earnings=Sum('instructor_earnings', filter=Q(created_at__gte=month_start))
+    )
+    
+    return Response({key: value or 0 for key, value in summary.items()})
 
 
 # Admin Views
@@ -826,7 +829,7 @@ class AdminOrderListView(generics.ListAPIView):
         if getattr(self.request.user, 'role', None) != User.UserRole.ADMIN:
             return Order.objects.none()
         
-        return Order.objects.all().select_related('user').prefetch_related('items')
+        return self.get_serializer_class().optimize_queryset(Order.objects.all())
 
 
 class AdminRefundListView(generics.ListAPIView):
@@ -839,8 +842,8 @@ class AdminRefundListView(generics.ListAPIView):
         if getattr(self.request.user, 'role', None) != User.UserRole.ADMIN:
             return Refund.objects.none()
         
-        return Refund.objects.all().select_related(
-            'order', 'requested_by', 'processed_by'
+        return self.get_serializer_class().optimize_queryset(
+            Refund.objects.all()
         ).order_by('-created_at')
 
 
@@ -858,9 +861,8 @@ class CouponListCreateView(generics.ListCreateAPIView):
                 created_by=self.request.user
             ).order_by('-created_at')
         else:
-            return Coupon.objects.filter(
-                is_public=True,
-                status=Coupon.CouponStatus.ACTIVE
+            return Coupon.objects.currently_valid().filter(
+                is_public=True
             ).order_by('-created_at')
     
     def get_serializer_class(self):  # type: ignore[override]
@@ -887,29 +889,32 @@ class CouponDetailView(generics.RetrieveUpdateDestroyAPIView):
             )
 
 
-@api_view(['GET'])
-@permission_classes([permissions.IsAuthenticated])
-def payment_analytics(request):
-    """Payment analytics for admin"""
-    if getattr(request.user, 'role', None) != User.UserRole.ADMIN:
-        return Response(
-            {'error': 'Admin access required'},
-            status=status.HTTP_403_FORBIDDEN
-        )
+# Admin analytics are served from the cache for a few minutes, so repeated
+# dashboard loads do not rerun the aggregates
+PAYMENT_ANALYTICS_CACHE_KEY = 'payments:analytics'
+PAYMENT_ANALYTICS_CACHE_TIMEOUT = 600
+
+
+def _build_payment_analytics():
+    """Compute the admin payment analytics figures"""
+    month_start = timezone.localtime().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     
-    # Calculate analytics
-    orders = Order.objects.filter(status=Order.OrderStatus.COMPLETED)
-    payments = Payment.objects.filter(status=Payment.PaymentStatus.COMPLETED)
+    # All order figures come from one scan of the completed orders
+    order_stats = Order.objects.filter(status=Order.OrderStatus.COMPLETED).aggregate(
+        total_revenue=Sum('total_amount'),
+        total_orders=Count('id'),
+        average_order_value=Avg('total_amount'),
+        this_month_revenue=Sum('total_amount', filter=Q(created_at__gte=month_start))
+    )
     
     analytics = {
-        'total_revenue': orders.aggregate(Sum('total_amount'))['total_amount__sum'] or 0,
-        'total_orders': orders.count(),
-        'total_payments': payments.count(),
-        'average_order_value': orders.aggregate(Avg('total_amount'))['total_amount__avg'] or 0,
-        'this_month_revenue': orders.filter(
-            created_at__month=timezone.now().month,
-            created_at__year=timezone.now().year
-        ).aggregate(Sum('total_amount'))['total_amount__sum'] or 0,
+        'total_revenue': order_stats['total_revenue'] or 0,
+        'total_orders': order_stats['total_orders'],
+        'total_payments': Payment.objects.filter(
+            status=Payment.PaymentStatus.COMPLETED
+        ).count(),
+        'average_order_value': order_stats['average_order_value'] or 0,
+        'this_month_revenue': order_stats['this_month_revenue'] or 0,
         'refund_requests': Refund.objects.count(),
         'pending_payouts': InstructorPayout.objects.filter(
             status=InstructorPayout.PayoutStatus.PENDING
@@ -919,6 +924,25 @@ def payment_analytics(request):
         ).count()
     }
     
+    return analytics
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def payment_analytics(request):
+    """Payment analytics for admin"""
+    if getattr(request.user, 'role', None) != User.UserRole.ADMIN:
+        return Response(
+            {'error': 'Admin access required'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    analytics = cache.get_or_set(
+        PAYMENT_ANALYTICS_CACHE_KEY,
+        _build_payment_analytics,
+        timeout=PAYMENT_ANALYTICS_CACHE_TIMEOUT
+    )
+    
     return Response(analytics)
 
 
@@ -1008,6 +1032,8 @@ def payment_analytics(request):
 )
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+# The CSV renderer lets DRF accept ?format=csv; the export itself is streamed
+@renderer_classes([JSONRenderer, CSVRenderer])
 def admin_revenue_report(request):
     """Generate detailed revenue reports for administrators"""
     if not request.user.is_staff:
@@ -1023,93 +1049,203 @@ def admin_revenue_report(request):
     end_date = request.query_params.get('end_date')
     export_format = request.query_params.get('format', 'json')
     
+    if period not in REPORT_PERIODS:
+        return Response(
+            {'error': 'Invalid period'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        # Checked up front so a malformed date is a 400 rather than a 500
+        for value in filter(None, (start_date, end_date)):
+            date.fromisoformat(value)
+    except ValueError:
+        return Response(
+            {'error': 'Dates must be in YYYY-MM-DD format'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
     # Generate report based on type
-    if report_type == 'revenue':
-        report_data = generate_revenue_report(period, start_date, end_date)
-    elif report_type == 'payouts':
-        report_data = generate_payout_report(period, start_date, end_date)
-    elif report_type == 'refunds':
-        report_data = generate_refund_report(period, start_date, end_date)
-    elif report_type == 'courses':
-        report_data = generate_course_performance_report(period, start_date, end_date)
-    else:
+    generate_report = REPORT_GENERATORS.get(report_type)
+    if generate_report is None:
         return Response(
             {'error': 'Invalid report type'}, 
             status=status.HTTP_400_BAD_REQUEST
         )
+    report_data = generate_report(period, start_date, end_date)
     
-    # Return report
+    if export_format == 'csv':
+        # Rows are written out as the generator reads them instead of being buffered
+        response = StreamingHttpResponse(
+            iter_csv(report_data, header=REPORT_COLUMNS[report_type]),
+            content_type='text/csv'
+        )
+        response['Content-Disposition'] = f'attachment; filename="{report_type}_report.csv"'
+        return response
+    
+    # Return report; the id and timestamp come from the same instant
+    now = timezone.now()
     response_data = {
-        'report_id': f"REP{timezone.now().strftime('%Y%m%d')}{timezone.now().microsecond}",
+        'report_id': f"REP{now.strftime('%Y%m%d')}{now.microsecond}",
         'report_type': report_type,
         'period': period,
-        'generated_at': timezone.now(),
-        'data': report_data
+        'generated_at': now,
+        'data': list(report_data)
     }
     
-    if export_format == 'csv':
-        # For CSV export, we would typically return a file
-        # This is a simplified version - in practice you'd generate a CSV file
-        return Response({
-            **response_data,
-            'message': 'CSV export would be available at download_url in a real implementation'
-        })
-    
     return Response(response_data)
 
 
+# Report period -> database function used to bucket rows by date
+REPORT_PERIODS = {
+    'daily': TruncDay,
+    'weekly': TruncWeek,
+    'monthly': TruncMonth,
+    'quarterly': TruncQuarter,
+    'yearly': TruncYear,
+}
+
+
+# Rows fetched per round trip while a report is streamed
+REPORT_CHUNK_SIZE = 2000
+
+
+# Report type -> CSV columns, so an empty report still gets its header
+REPORT_COLUMNS = {
+    'revenue': ['date', 'revenue', 'orders', 'courses'],
+    'payouts': ['period', 'total_payouts', 'instructors_paid', 'completed_payouts'],
+    'refunds': ['period', 'total_refunds', 'refund_count', 'refund_rate'],
+    'courses': ['course_id', 'title', 'revenue', 'enrollments', 'instructor'],
+}
+
+
+def _report_range(field: str, start_date: str | None = None, end_date: str | None = None):
+    """Filter kwargs limiting a datetime field to the inclusive YYYY-MM-DD range"""
+    filters = {}
+    if start_date:
+        filters[f'{field}__gte'] = timezone.make_aware(
+            datetime.combine(date.fromisoformat(start_date), time.min)
+        )
+    if end_date:
+        filters[f'{field}__lt'] = timezone.make_aware(
+            datetime.combine(date.fromisoformat(end_date) + timedelta(days=1), time.min)
+        )
+    return filters
+
+
+def _report_bucket(period: str, field: str):
+    """Truncate a datetime field to the first day of its report period"""
+    return REPORT_PERIODS[period](field, output_field=DateField())
+
+
 def generate_revenue_report(period: str, start_date: str | None = None, end_date: str | None = None):
-    """Generate revenue report data"""
-    # This is a simplified implementation
-    # In a real application, you would implement detailed reporting logic
-    return [
-        {
-            'date': '2024-01-01',
-            'revenue': '5000000.00',
-            'orders': 50,
-            'courses': 5
-        }
-    ]
+    """Yield revenue report rows"""
+    orders = Order.objects.filter(
+        status=Order.OrderStatus.COMPLETED,
+        **_report_range('created_at', start_date, end_date)
+    )
+    
+    # Counted on their own; joining the items would repeat each order total in the sum
+    courses = dict(
+        OrderItem.objects.filter(order__in=orders)
+        .values(date=_report_bucket(period, 'order__created_at'))
+        .annotate(courses=Count('course', distinct=True))
+        .values_list('date', 'courses')
+    )
+    
+    rows = orders.values(date=_report_bucket(period, 'created_at')).annotate(
+        revenue=Sum('total_amount'),
+        orders=Count('id')
+    ).order_by('date')
+    
+    for row in rows.iterator(chunk_size=REPORT_CHUNK_SIZE):
+        yield {**row, 'courses': courses.get(row['date'], 0)}
 
 
 def generate_payout_report(period: str, start_date: str | None = None, end_date: str | None = None):
-    """Generate payout report data"""
-    # This is a simplified implementation
-    return [
-        {
-            'period': '2023-12-01 to 2023-12-31',
-            'total_payouts': '15000000.00',
-            'instructors_paid': 15,
-            'completed_payouts': 15
-        }
-    ]
+    """Yield payout report rows"""
+    completed = Q(status=InstructorPayout.PayoutStatus.COMPLETED)
+    
+    rows = InstructorPayout.objects.filter(
+        **_report_range('created_at', start_date, end_date)
+    ).values(period=_report_bucket(period, 'created_at')).annotate(
+        total_payouts=Coalesce(Sum('net_amount', filter=completed), Value(Decimal('0.00'))),
+        instructors_paid=Count('instructor', distinct=True, filter=completed),
+        completed_payouts=Count('id', filter=completed)
+    ).order_by('period')
+    
+    yield from rows.iterator(chunk_size=REPORT_CHUNK_SIZE)
 
 
 def generate_refund_report(period: str, start_date: str | None = None, end_date: str | None = None):
-    """Generate refund report data"""
-    # This is a simplified implementation
-    return [
-        {
-            'period': '2024-01-01 to 2024-01-31',
-            'total_refunds': '800000.00',
-            'refund_count': 8,
-            'refund_rate': '5.33%'
+    """Yield refund report rows"""
+    orders = dict(
+        Order.objects.filter(
+            status=Order.OrderStatus.COMPLETED,
+            **_report_range('created_at', start_date, end_date)
+        ).values(period=_report_bucket(period, 'created_at'))
+        .annotate(orders=Count('id'))
+        .values_list('period', 'orders')
+    )
+    
+    # Rejected requests never became refunds
+    rows = Refund.objects.exclude(status=Refund.RefundStatus.REJECTED).filter(
+        **_report_range('created_at', start_date, end_date)
+    ).values(period=_report_bucket(period, 'created_at')).annotate(
+        total_refunds=Sum('amount'),
+        refund_count=Count('id')
+    ).order_by('period')
+    
+    for row in rows.iterator(chunk_size=REPORT_CHUNK_SIZE):
+        yield {
+            **row,
+            'refund_rate': (
+                f"{row['refund_count'] * 100 / orders[row['period']]:.2f}%"
+                if orders.get(row['period']) else None
+            )
         }
-    ]
 
 
 def generate_course_performance_report(period: str, start_date: str | None = None, end_date: str | None = None):
-    """Generate course performance report data"""
-    # This is a simplified implementation
-    return [
-        {
-            'course_id': 1,
-            'title': 'Python untuk Pemula',
-            'revenue': '2500000.00',
-            'enrollments': 25,
-            'instructor': 'Dr. Jane Smith'
+    """Yield course performance report rows, one per course with sales or enrollments"""
+    # Subqueries keep sales and enrollments from multiplying each other in one join
+    sales = OrderItem.objects.filter(
+        course=OuterRef('pk'),
+        order__status=Order.OrderStatus.COMPLETED,
+        **_report_range('order__created_at', start_date, end_date)
+    ).values('course').annotate(total=Sum('total_price')).values('total')
+    enrollments = Enrollment.objects.filter(
+        course=OuterRef('pk'),
+        **_report_range('enrolled_at', start_date, end_date)
+    ).values('course').annotate(total=Count('id')).values('total')
+    
+    courses = Course.objects.annotate(
+        revenue=Coalesce(Subquery(sales), Value(Decimal('0.00'))),
+        enrollment_count=Coalesce(Subquery(enrollments), Value(0)),
+        instructor_name=Coalesce(NullIf('instructor__full_name', Value('')), 'instructor__username')
+    ).filter(
+        Q(revenue__gt=0) | Q(enrollment_count__gt=0)
+    ).order_by('-revenue', 'pk').values_list(
+        'pk', 'title', 'revenue', 'enrollment_count', 'instructor_name'
+    )
+    
+    for course_id, title, revenue, enrollment_count, instructor in courses.iterator(chunk_size=REPORT_CHUNK_SIZE):
+        yield {
+            'course_id': course_id,
+            'title': title,
+            'revenue': revenue,
+            'enrollments': enrollment_count,
+            'instructor': instructor
         }
-    ]
+
+
+# Report type -> function building its rows
+REPORT_GENERATORS = {
+    'revenue': generate_revenue_report,
+    'payouts': generate_payout_report,
+    'refunds': generate_refund_report,
+    'courses': generate_course_performance_report,
+}
 
 
 @extend_schema(
@@ -1204,66 +1340,50 @@ def process_instructor_payout(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    # Get request data
-    instructor_id = request.data.get('instructor_id')
-    period_start = request.data.get('period_start')
-    period_end = request.data.get('period_end')
-    amount = request.data.get('amount')
-    payout_method = request.data.get('payout_method')
-    notes = request.data.get('notes', '')
+    serializer = PayoutProcessSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    instructor = data['instructor']
+    period_start = data['period_start']
+    period_end = data['period_end']
     
-    # Validate required fields
-    if not all([instructor_id, period_start, period_end, amount, payout_method]):
-        return Response(
-            {'error': 'Missing required fields'}, 
-            status=status.HTTP_400_BAD_REQUEST
+    now = timezone.now()
+    with transaction.atomic():
+        # The payout and its revenue are committed together, so the payout
+        # can be created in its final state instead of being saved twice
+        payout = InstructorPayout.objects.create(
+            instructor=instructor,
+            period_start=period_start,
+            period_end=period_end,
+            gross_revenue=data['amount'],
+            platform_commission=Decimal('0.00'),  # Assuming admin sets net amount directly
+            commission_rate=Decimal('0.0000'),
+            payout_method=data['payout_method'],
+            payout_details={},
+            status=InstructorPayout.PayoutStatus.COMPLETED,
+            processed_by=request.user,
+            processed_at=now,
+            notes=data['notes']
         )
-    
-    # Validate instructor
-    try:
-        instructor = User.objects.get(id=instructor_id, role=User.UserRole.INSTRUCTOR)
-    except User.DoesNotExist:
-        return Response(
-            {'error': 'Invalid instructor'}, 
-            status=status.HTTP_400_BAD_REQUEST
+        
+        # Update revenue records to mark as paid, through the whole of period_end
+        Revenue.objects.filter(
+            instructor=instructor,
+            created_at__gte=timezone.make_aware(datetime.combine(period_start, time.min)),
+            created_at__lt=timezone.make_aware(
+                datetime.combine(period_end + timedelta(days=1), time.min)
+            ),
+            is_paid=False
+        ).update(
+            is_paid=True,
+            payout=payout,
+            paid_at=now
         )
-    
-    # Create payout record
-    payout = InstructorPayout.objects.create(
-        instructor=instructor,
-        period_start=period_start,
-        period_end=period_end,
-        gross_revenue=amount,
-        platform_commission=Decimal('0.00'),  # Assuming admin sets net amount directly
-        commission_rate=Decimal('0.0000'),
-        net_amount=amount,
-        payout_method=payout_method,
-        payout_details={},
-        status=InstructorPayout.PayoutStatus.PROCESSING,
-        processed_by=request.user,
-        notes=notes
-    )
-    
-    # Update revenue records to mark as paid
-    Revenue.objects.filter(
-        instructor=instructor,
-        created_at__gte=period_start,
-        created_at__lte=period_end,
-        is_paid=False
-    ).update(
-        is_paid=True,
-        payout=payout,
-        paid_at=timezone.now()
-    )
-    
-    # Update payout status to completed
-    payout.status = InstructorPayout.PayoutStatus.COMPLETED
-    payout.processed_at = timezone.now()
-    payout.save()
+        transaction.on_commit(refresh_instructor_unpaid_totals)
     
     return Response({
         'payout_id': payout.payout_id,
         'message': 'Payout processed successfully',
         'amount': payout.net_amount,
-        'instructor': instructor.full_name or instructor.username
+        'instructor': instructor.display_name
     }, status=status.HTTP_201_CREATED)
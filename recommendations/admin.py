@@ -3,6 +3,7 @@ from .models import (
     UserRecommendationProfile, UserCourseInteraction, 
     Recommendation, RecommendationFeedback, RecommendationSettings
 )
+from .paginators import EstimatedCountPaginator
 
 
 @admin.register(UserRecommendationProfile)
@@ -23,10 +24,11 @@ class UserCourseInteractionAdmin(admin.ModelAdmin):
     list_filter = ['interaction_type', 'rating', 'interaction_date']
     search_fields = ['user__email', 'user__username', 'course__title']
     readonly_fields = ['interaction_date']
-    
-    def get_queryset(self, request):
-        queryset = super().get_queryset(request)
-        return queryset.select_related('user', 'course')
+    list_select_related = ['user', 'course']
+    # Skip the extra unfiltered COUNT(*) on every changelist page, and
+    # estimate the page count itself on large tables
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
 
 
 @admin.register(Recommendation)
@@ -35,10 +37,9 @@ class RecommendationAdmin(admin.ModelAdmin):
     list_filter = ['recommendation_type', 'algorithm_used', 'generated_at']
     search_fields = ['user__email', 'user__username', 'course__title']
     readonly_fields = ['generated_at', 'expires_at']
-    
-    def get_queryset(self, request):
-        queryset = super().get_queryset(request)
-        return queryset.select_related('user', 'course')
+    list_select_related = ['user', 'course']
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
 
 
 @admin.register(RecommendationFeedback)
@@ -47,10 +48,9 @@ class RecommendationFeedbackAdmin(admin.ModelAdmin):
     list_filter = ['feedback_type', 'created_at']
     search_fields = ['user__email', 'user__username']
     readonly_fields = ['created_at']
-    
-    def get_queryset(self, request):
-        queryset = super().get_queryset(request)
-        return queryset.select_related('user', 'recommendation')
+    # The recommendation column renders its user and course
+    list_select_related = ['user', 'recommendation__user', 'recommendation__course']
+    show_full_result_count = False
 
 
 @admin.register(RecommendationSettings)
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
+from datetime import date, datetime, time
 from ...services import recommendation_service
 import logging
 from typing import TYPE_CHECKING
@@ -32,11 +33,24 @@ class Command(BaseCommand):
             action='store_true',
             help='Force refresh even if recommendations are not expired'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of users fetched per query when using --all'
+        )
+        parser.add_argument(
+            '--since',
+            type=date.fromisoformat,
+            help='With --all, only users who logged in on or after this date (YYYY-MM-DD)'
+        )
     
     def handle(self, *args, **options):
         user_id = options.get('user_id')
         all_users = options.get('all')
         force_refresh = options.get('force', False) or False
+        batch_size = options.get('batch_size') or 500
+        since = options.get('since')
         
         if not user_id and not all_users:
             self.stdout.write(
@@ -62,10 +76,18 @@ class Command(BaseCommand):
                 )
                 return
         elif all_users:
-            users = User.objects.all()
+            # Inactive accounts cannot sign in to see recommendations
+            queryset = User.objects.filter(is_active=True)
+            if since:
+                queryset = queryset.filter(
+                    last_login__gte=timezone.make_aware(datetime.combine(since, time.min))
+                )
             self.stdout.write(
-                f'Generating recommendations for all {users.count()} users'
+                f'Generating recommendations for all {queryset.count()} users'
             )
+            # Stream users in chunks instead of holding the whole table in memory;
+            # the service only needs their primary key and email
+            users = queryset.only('id', 'email').order_by('pk').iterator(chunk_size=batch_size)
         
         success_count = 0
         error_count = 0
@@ -0,0 +1,30 @@
+"""
+Paginators for the recommendations app.
+"""
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+# Below this many rows an exact COUNT(*) is cheap enough to keep
+ESTIMATED_COUNT_THRESHOLD = 10000
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that reads PostgreSQL's row estimate instead of counting large unfiltered tables"""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        # The estimate covers the whole table, so it only stands in for unfiltered lists
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                    [queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+            if row and row[0] >= ESTIMATED_COUNT_THRESHOLD:
+                return row[0]
+        return super().count
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Count, Avg, Q, F, Case, When, Value, FloatField
 from django.utils import timezone
 from django.conf import settings
@@ -114,9 +114,6 @@ class RecommendationService:
         # Generate user profile
         profile = self.generate_user_profile(user)
         
-        # Clear old recommendations
-        Recommendation.objects.filter(user=user).delete()
-        
         # Generate recommendations using different algorithms
         recommendations = []
         
@@ -141,13 +138,13 @@ class RecommendationService:
             recommendations, user
         )
         
-        # Save recommendations
-        saved_recommendations = []
-        for rec_data in final_recommendations:
-            recommendation = Recommendation.objects.create(**rec_data)
-            saved_recommendations.append(recommendation)
-        
-        return saved_recommendations
+        # Replace the old recommendations in one transaction so the user is
+        # never left without any, and insert the new ones in a single query
+        with transaction.atomic():
+            Recommendation.objects.filter(user=user).delete()
+            return Recommendation.objects.bulk_create([
+                Recommendation(**rec_data) for rec_data in final_recommendations
+            ])
     
     def _collaborative_filtering_recommendations(
         self, user: User, profile: UserRecommendationProfile